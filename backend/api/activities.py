@@ -1,98 +1,179 @@
 """Activities endpoints."""
 
+import asyncio
 import logging
-from datetime import datetime
+import secrets
+from concurrent.futures import Executor
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Request, Query
-from backend.services import SessionManager, DataProcessor
-from backend.models.activity import Activity, ActivitySummary
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import ORJSONResponse
+from backend.services import SessionManager, DataProcessor, GarminService
+from backend.services.cache import LRUCache
+from backend.api.deps import require_session
+from backend.models.activity import ACTIVITY_FIELDS, ActivityRow, ActivitySummary, FetchQuery
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/activities", tags=["activities"])
 
+# Number of raw activities handed to each parse worker
+PARSE_CHUNK_SIZE = 64
 
-def get_session_data(request: Request):
-    """Helper to get and validate session."""
-    session_manager: SessionManager = request.app.state.session_manager
-    session_id = request.cookies.get("session_id")
+# Type filters whose results are memoized per session (filters are client-controlled)
+FILTER_CACHE_SIZE = 16
 
-    if not session_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+router = APIRouter(prefix="/activities", tags=["activities"], default_response_class=ORJSONResponse)
 
-    session = session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=401, detail="Session expired")
 
-    return session
+def get_filtered_activities(
+    session: dict, types_filter: Optional[frozenset[str]] = None
+) -> tuple[list[ActivityRow], ActivitySummary]:
+    """
+    Get filtered activities and their summary, memoized in the session.
+
+    Results are keyed by the activities version and the normalized type filter,
+    so repeated polls with an unchanged activity list skip the recomputation.
+    The cache lives in the session itself, keeps the FILTER_CACHE_SIZE most
+    recently used filters and is dropped along with the session.
+
+    Args:
+        session: Session data
+        types_filter: Activity types to include (optional)
+
+    Returns:
+        Tuple of (filtered activities, summary)
+    """
+    types_key = tuple(sorted(types_filter)) if types_filter else None
+    key = (session.get("activities_version", ""), types_key)
+    cache = session.get("filter_cache")
+    if cache is None:
+        cache = session["filter_cache"] = LRUCache(FILTER_CACHE_SIZE)
+
+    cached = cache.get(key)
+    if cached is None:
+        filtered = DataProcessor.filter_activities(
+            session.get("activities", []),
+            activity_types=types_filter,
+            type_index=session.get("activities_by_type"),
+        )
+
+        # Combine the per-type summaries computed in /fetch instead of rescanning
+        summary_by_type = session.get("summary_by_type", {})
+        if types_key is None:
+            partials = list(summary_by_type.values())
+        else:
+            partials = [summary_by_type[t] for t in types_key if t in summary_by_type]
+        summary = ActivitySummary.merge(partials)
+
+        cached = (filtered, summary)
+        cache.set(key, cached)
+
+    return cached
+
+
+async def parse_activities(executor: Executor, raw_activities: list[dict]) -> list[ActivityRow]:
+    """
+    Parse raw activities in chunks on an executor, off the event loop.
+
+    Args:
+        executor: Executor to run the parsing on
+        raw_activities: Raw activity data from Garmin API
+
+    Returns:
+        List of parsed activities, in input order
+    """
+    loop = asyncio.get_running_loop()
+    chunks = [
+        raw_activities[i : i + PARSE_CHUNK_SIZE]
+        for i in range(0, len(raw_activities), PARSE_CHUNK_SIZE)
+    ]
+    batches = await asyncio.gather(
+        *(loop.run_in_executor(executor, DataProcessor.parse_activities, chunk) for chunk in chunks)
+    )
+    return [activity for batch in batches for activity in batch]
 
 
 @router.post("/fetch")
 async def fetch_activities(
     request: Request,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    session: dict = Depends(require_session),
+    query: FetchQuery = Depends(),
 ):
     """
     Fetch activities from Garmin Connect.
 
     Args:
-        start_date: Start date (ISO format)
-        end_date: End date (ISO format)
+        query: Start and end dates (ISO format, validated by pydantic)
 
     Returns:
         List of activities and summary
     """
-    session = get_session_data(request)
     garmin_service = session.get("garmin_service")
 
     if not garmin_service:
         raise HTTPException(status_code=500, detail="Garmin service not initialized")
 
-    # Parse dates or use defaults
-    if start_date:
-        try:
-            start = datetime.fromisoformat(start_date)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid start_date format")
-    else:
-        start = session.get("start_date")
-
-    if end_date:
-        try:
-            end = datetime.fromisoformat(end_date)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid end_date format")
-    else:
-        end = session.get("end_date")
+    # Use session dates as defaults
+    start = query.start_date or session.get("start_date")
+    end = query.end_date or session.get("end_date")
 
     try:
-        # Fetch activities from Garmin
-        raw_activities = await garmin_service.get_activities(start, end)
+        # Fetch activities from Garmin, long ranges as concurrent windows
+        windows = GarminService.split_date_range(start, end)
+        batches = await asyncio.gather(*(garmin_service.get_activities(s, e) for s, e in windows))
+
+        # Garmin returns newest first within a window, so concatenate newest window first
+        raw_activities = [raw for batch in reversed(batches) for raw in batch]
 
         # Parse activities
-        activities = [DataProcessor.parse_activity(raw) for raw in raw_activities]
+        activities = await parse_activities(request.app.state.parse_pool, raw_activities)
 
-        # Update session with fetched activities
+        # Plain dicts built once per fetch (orjson encodes them directly), so list
+        # responses don't go through model_dump for every activity. Kept in activity
+        # order, as ids may be missing or repeated
+        dumped = [{field: getattr(a, field) for field in ACTIVITY_FIELDS} for a in activities]
+
+        # Index positions by type so filtering doesn't scan every activity
+        type_index = DataProcessor.index_by_type(activities)
+
+        # Columnar copy for summaries and exports
+        arrays = DataProcessor.to_columns(activities)
+
+        # Update session with fetched activities (a new version invalidates cached
+        # filter results and ETags; it is random rather than a counter so it stays
+        # unique when other workers resume the session with their own activities)
         session_manager: SessionManager = request.app.state.session_manager
         session_manager.update_session(
             request.cookies.get("session_id"),
             {
                 "activities": activities,
+                "activities_dumped": dumped,
+                "activity_types_sorted": sorted(type_index),
+                "activities_by_type": type_index,
+                "activity_columns": arrays,
+                "summary_by_type": DataProcessor.calculate_summaries_by_type(
+                    activities, type_index, arrays
+                ),
+                "activities_version": secrets.token_hex(8),
+                "filter_cache": None,
+                "dataframe_cache": None,
                 "start_date": start,
                 "end_date": end,
             },
         )
 
         # Calculate summary
-        summary = DataProcessor.calculate_summary(activities)
+        _, summary = get_filtered_activities(session)
 
         logger.info(f"Fetched {len(activities)} activities from {start} to {end}")
 
-        return {
-            "activities": [a.model_dump() for a in activities],
-            "summary": summary.model_dump(),
-            "count": len(activities),
-        }
+        # Payload is already JSON-ready: return a response directly so FastAPI
+        # doesn't walk it again with jsonable_encoder
+        return ORJSONResponse(
+            {
+                "activities": dumped,
+                "summary": summary.model_dump(),
+                "count": len(activities),
+            }
+        )
 
     except ValueError as e:
         logger.error(f"Error fetching activities: {e}")
@@ -104,7 +185,7 @@ async def fetch_activities(
 
 @router.get("/list")
 async def list_activities(
-    request: Request,
+    session: dict = Depends(require_session),
     activity_types: Optional[str] = Query(None, description="Comma-separated activity types"),
 ):
     """
@@ -116,7 +197,6 @@ async def list_activities(
     Returns:
         Filtered activities and summary
     """
-    session = get_session_data(request)
     activities = session.get("activities", [])
 
     if not activities:
@@ -125,42 +205,35 @@ async def list_activities(
     # Parse activity types filter
     types_filter = None
     if activity_types:
-        types_filter = [t.strip() for t in activity_types.split(",")]
-
-    # Filter activities
-    filtered = DataProcessor.filter_activities(activities, activity_types=types_filter)
-
-    # Calculate summary
-    summary = DataProcessor.calculate_summary(filtered)
+        types_filter = frozenset(t.strip() for t in activity_types.split(","))
+
+    # Filter activities and calculate summary
+    filtered, summary = get_filtered_activities(session, types_filter)
+    dumped = session.get("activities_dumped", [])
+    if types_filter:
+        positions = DataProcessor.positions_for_types(
+            session.get("activities_by_type", {}), types_filter
+        )
+        dumped = [dumped[i] for i in positions]
 
-    return {
-        "activities": [a.model_dump() for a in filtered],
-        "summary": summary.model_dump(),
-        "count": len(filtered),
-    }
+    return ORJSONResponse(
+        {
+            "activities": dumped,
+            "summary": summary.model_dump(),
+            "count": len(filtered),
+        }
+    )
 
 
 @router.get("/summary")
-async def get_summary(request: Request) -> ActivitySummary:
+async def get_summary(session: dict = Depends(require_session)) -> ActivitySummary:
     """Get summary statistics for all activities in session."""
-    session = get_session_data(request)
-    activities = session.get("activities", [])
-
-    summary = DataProcessor.calculate_summary(activities)
+    _, summary = get_filtered_activities(session)
     return summary
 
 
 @router.get("/types")
-async def get_activity_types(request: Request):
+async def get_activity_types(session: dict = Depends(require_session)):
     """Get list of available activity types from current activities."""
-    session = get_session_data(request)
-    activities = session.get("activities", [])
-
-    if not activities:
-        return {"types": []}
-
-    # Get unique activity types
-    types = list(set(a.activity_type for a in activities))
-    types.sort()
-
-    return {"types": types}
+    # Computed once in /fetch when the activities are stored
+    return {"types": session.get("activity_types_sorted", [])}
@@ -57,6 +57,7 @@ async def login(
                 "activities": [],
             },
         )
+        await session_manager.share_session(session_id)
 
         logger.info(f"User {email} logged in successfully")
 
@@ -89,16 +90,14 @@ async def logout(request: Request, response: Response):
     session_id = request.cookies.get("session_id")
 
     if session_id:
-        session = session_manager.get_session(session_id)
+        # Delete session
+        session = await session_manager.end_session(session_id)
         if session:
             # Logout from Garmin
             garmin_service = session.get("garmin_service")
             if garmin_service:
                 garmin_service.logout()
 
-        # Delete session
-        session_manager.delete_session(session_id)
-
     # Clear cookie and redirect
     redirect_response = RedirectResponse(url="/", status_code=303)
     redirect_response.delete_cookie("session_id")
@@ -114,7 +113,7 @@ async def status(request: Request):
     if not session_id:
         return {"authenticated": False}
 
-    session = session_manager.get_session(session_id)
+    session, active_sessions = await session_manager.resolve_session_and_count(session_id)
     if not session:
         return {"authenticated": False}
 
@@ -122,5 +121,5 @@ async def status(request: Request):
         "authenticated": True,
         "email": session.get("email"),
         "first_name": session.get("first_name", "User"),
-        "active_sessions": session_manager.get_active_session_count(),
+        "active_sessions": active_sessions,
     }
@@ -0,0 +1,82 @@
+"""HTTP caching for session-scoped GET endpoints."""
+
+import hashlib
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from backend.services import SessionManager
+
+# Paths whose GET responses only change when the session's activities change
+CACHEABLE_PREFIXES = ("/activities/", "/export/")
+
+# Responses are user-specific, and clients must revalidate so a new /fetch
+# is picked up immediately; unchanged data then costs a bodiless 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(session_id: str, activities_version: str, request: Request) -> str:
+    """
+    Compute the ETag of a session-scoped GET response.
+
+    Args:
+        session_id: Session ID
+        activities_version: Version of the activities stored in the session (random per /fetch)
+        request: Incoming request (path and query identify the resource)
+
+    Returns:
+        Quoted ETag value
+    """
+    # List parameters (activity_types, columns) are order-insensitive
+    params = sorted(
+        (k, ",".join(sorted(part.strip() for part in v.split(","))))
+        for k, v in request.query_params.multi_items()
+    )
+    query = "&".join(f"{k}={v}" for k, v in params)
+    key = f"{session_id}:{activities_version}:{request.url.path}?{query}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Quoted ETag of the current response
+
+    Returns:
+        True if the client's cached copy is current
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """Add ETag validators to activity and export GETs, answering 304 on a match."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method != "GET" or not request.url.path.startswith(CACHEABLE_PREFIXES):
+            return await call_next(request)
+
+        session_id = request.cookies.get("session_id")
+        session = getattr(request.state, "session", None)
+        if session is None and session_id:
+            session_manager: SessionManager = request.app.state.session_manager
+            session = await session_manager.resolve_session(session_id)
+
+        # Let the endpoint produce the 401
+        if session is None:
+            return await call_next(request)
+
+        etag = compute_etag(session_id, session.get("activities_version", ""), request)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
@@ -0,0 +1,37 @@
+"""Shared FastAPI dependencies."""
+
+from typing import Any, Optional
+from fastapi import Cookie, HTTPException, Request
+from backend.services import SessionManager
+
+
+async def require_session(
+    request: Request, session_id: Optional[str] = Cookie(None)
+) -> dict[str, Any]:
+    """
+    Resolve the current session from the session cookie.
+
+    Reuses the session already resolved by AuthRequiredMiddleware when present.
+
+    Args:
+        session_id: Session ID cookie
+
+    Returns:
+        Session data
+
+    Raises:
+        HTTPException: 401 if there is no session cookie or the session expired
+    """
+    session = getattr(request.state, "session", None)
+    if session is not None:
+        return session
+
+    if not session_id:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    session_manager: SessionManager = request.app.state.session_manager
+    session = await session_manager.resolve_session(session_id)
+    if not session:
+        raise HTTPException(status_code=401, detail="Session expired")
+
+    return session
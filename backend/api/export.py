@@ -1,182 +1,322 @@
 """Export endpoints for PDF and CSV."""
 
+import asyncio
+import csv
 import logging
 import io
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter, HTTPException, Request, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import Response, StreamingResponse
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from backend.services import SessionManager, DataProcessor
+from backend.models.activity import ActivityRow, ActivitySummary
+from backend.services import DataProcessor
+from backend.services.cache import LRUCache
+from backend.api.deps import require_session
+from backend.api.activities import get_filtered_activities
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/export", tags=["export"])
 
 
-def get_session_data(request: Request):
-    """Helper to get and validate session."""
-    session_manager: SessionManager = request.app.state.session_manager
-    session_id = request.cookies.get("session_id")
+@dataclass(slots=True)
+class ExportBundle:
+    """Activities of an export request, shared by the CSV and PDF exports."""
 
-    if not session_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    session: dict
+    types_filter: Optional[frozenset[str]]
+    filtered: list[ActivityRow]
+    summary: ActivitySummary
 
-    session = session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=401, detail="Session expired")
 
-    return session
-
-
-@router.get("/csv")
-async def export_csv(
-    request: Request,
+def export_bundle(
+    session: dict = Depends(require_session),
     activity_types: Optional[str] = Query(None, description="Comma-separated activity types"),
-    columns: Optional[str] = Query(None, description="Comma-separated column keys to export"),
-):
+) -> ExportBundle:
     """
-    Export activities to CSV.
+    Resolve the activities to export for the request's type filter.
 
     Args:
         activity_types: Comma-separated list of activity types to filter
-        columns: Comma-separated list of column keys to export
 
     Returns:
-        CSV file
-    """
-    session = get_session_data(request)
-    activities = session.get("activities", [])
+        Export bundle with the filtered activities and their summary
 
-    if not activities:
+    Raises:
+        HTTPException: 404 if there are no activities or none match the filter
+    """
+    if not session.get("activities"):
         raise HTTPException(status_code=404, detail="No activities found")
 
     # Parse activity types filter
     types_filter = None
     if activity_types:
-        types_filter = [t.strip() for t in activity_types.split(",")]
+        types_filter = frozenset(t.strip() for t in activity_types.split(","))
 
-    # Filter activities
-    filtered = DataProcessor.filter_activities(activities, activity_types=types_filter)
+    # Filter activities and calculate summary
+    filtered, summary = get_filtered_activities(session, types_filter)
 
     if not filtered:
         raise HTTPException(status_code=404, detail="No activities match the filter")
 
-    # Convert to DataFrame
-    df = DataProcessor.activities_to_dataframe(filtered)
-
-    # Map frontend column keys to DataFrame column names
-    # Order matches frontend availableColumns array
-    column_mapping = {
-        "start_time": ("start_time", "Date"),
-        "activity_name": ("activity_name", "Activity Name"),
-        "activity_type": ("activity_type", "Type"),
-        "duration": ("duration_formatted", "Duration"),
-        "distance": ("distance_km", "Distance (km)"),
-        "avg_speed": ("avg_speed_kmh", "Avg Speed (km/h)"),
-        "max_speed": ("max_speed_kmh", "Max Speed (km/h)"),
-        "avg_power": ("avg_power", "Avg Power (W)"),
-        "max_power": ("max_power", "Max Power (W)"),
-        "avg_hr": ("avg_hr", "Avg HR (bpm)"),
-        "max_hr": ("max_hr", "Max HR (bpm)"),
-        "total_ascent": ("total_ascent", "Elevation Gain (m)"),
-        "max_elevation": ("max_elevation", "Max Elevation (m)"),
-        "avg_cadence": ("avg_cadence", "Avg Cadence (rpm)"),
-        "max_cadence": ("max_cadence", "Max Cadence (rpm)"),
-        "calories": ("calories", "Calories"),
-    }
-
-    # Parse selected columns
-    selected_keys = None
-    if columns:
-        selected_keys = [c.strip() for c in columns.split(",")]
-
-    # Build export columns list maintaining order from column_mapping
-    export_columns_list = []
-
-    # If columns are selected, reorder them to match column_mapping order
-    if selected_keys:
-        selected_set = set(selected_keys)
-        ordered_keys = [key for key in column_mapping.keys() if key in selected_set]
-    else:
-        ordered_keys = list(column_mapping.keys())
-
-    for key in ordered_keys:
-        if key not in column_mapping:
-            continue
-        df_col, label = column_mapping[key]
-        # Skip if column doesn't exist in DataFrame
-        if df_col not in df.columns:
-            continue
-        # Skip if column has no data (all null or 0)
-        if df[df_col].notna().sum() == 0 or (df[df_col].fillna(0) == 0).all():
-            continue
-        export_columns_list.append((df_col, label))
+    return ExportBundle(session, types_filter, filtered, summary)
 
-    if not export_columns_list:
-        raise HTTPException(status_code=404, detail="No data to export with selected columns")
 
-    # Select and rename columns in order
-    df_cols = [col for col, _ in export_columns_list]
-    labels = {col: label for col, label in export_columns_list}
-    df_export = df[df_cols].rename(columns=labels)
-
-    # Add totals row
-    totals = {}
-    first_column = True
-
-    for df_col, label in export_columns_list:
-        if first_column:
-            totals[label] = "TOTAL"
-            first_column = False
-        elif label in ["Activity Name", "Type", "Date"]:
-            totals[label] = ""
-        elif label == "Duration":
-            # Sum durations
-            total_seconds = df["duration"].sum() if "duration" in df.columns else 0
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-            totals[label] = f"{hours:02d}:{minutes:02d}"
-        elif label == "Distance (km)":
-            # Sum distance with 2 decimals
-            totals[label] = round(df_export[label].sum(), 2) if df_export[label].notna().any() else ""
-        elif "Max" in label:
-            # Max for max metrics
-            value = df_export[label].max() if df_export[label].notna().any() else ""
-            if value and "Speed" in label:
-                totals[label] = round(value, 1)
-            elif value:
-                totals[label] = int(round(value, 0))
-            else:
-                totals[label] = ""
-        elif "Avg" in label:
-            # Average for avg metrics
-            value = df_export[label].mean() if df_export[label].notna().any() else ""
-            if value and "Speed" in label:
-                totals[label] = round(value, 1)
-            elif value:
-                totals[label] = int(round(value, 0))
-            else:
-                totals[label] = ""
-        elif label in ["Elevation Gain (m)", "Calories"]:
-            # Sum for elevation and calories (integers)
-            value = df_export[label].sum() if df_export[label].notna().any() else ""
-            totals[label] = int(round(value, 0)) if value else ""
+def parse_column_keys(columns: Optional[str]) -> Optional[frozenset[str]]:
+    """
+    Parse the comma-separated column keys of an export request.
+
+    Args:
+        columns: Comma-separated column keys (optional)
+
+    Returns:
+        Selected column keys, or None to export every column
+    """
+    if not columns:
+        return None
+    return frozenset(c.strip() for c in columns.split(","))
+
+
+def resolve_export_columns(
+    column_mapping: dict[str, tuple],
+    selected_keys: Optional[frozenset[str]],
+    has_data: Callable[[str], bool],
+) -> list[tuple]:
+    """
+    Resolve the columns of an export.
+
+    Args:
+        column_mapping: Column keys mapped to their export definition, in export order
+        selected_keys: Selected column keys (optional, defaults to all)
+        has_data: Tells whether the column with the given key has data
+
+    Returns:
+        Export definitions of the selected columns with data, in column_mapping order
+    """
+    return [
+        column
+        for key, column in column_mapping.items()
+        if (selected_keys is None or key in selected_keys) and has_data(key)
+    ]
+
+
+# Exports with more rows than this are streamed instead of sent in one piece
+CSV_STREAM_THRESHOLD_ROWS = 5000
+
+# Number of CSV rows sent per streamed chunk
+CSV_CHUNK_ROWS = 256
+
+# CSV column keys mapped to (label, activity field, value kind)
+# Order matches frontend availableColumns array
+CSV_COLUMNS = {
+    "start_time": ("Date", "start_time", "date"),
+    "activity_name": ("Activity Name", "activity_name", "text"),
+    "activity_type": ("Type", "activity_type", "text"),
+    "duration": ("Duration", "duration_formatted", "text"),
+    "distance": ("Distance (km)", "distance_km", "float"),
+    "avg_speed": ("Avg Speed (km/h)", "avg_speed_kmh", "float"),
+    "max_speed": ("Max Speed (km/h)", "max_speed_kmh", "float"),
+    "avg_power": ("Avg Power (W)", "avg_power", "int"),
+    "max_power": ("Max Power (W)", "max_power", "int"),
+    "avg_hr": ("Avg HR (bpm)", "avg_hr", "int"),
+    "max_hr": ("Max HR (bpm)", "max_hr", "int"),
+    "total_ascent": ("Elevation Gain (m)", "total_ascent", "int"),
+    "max_elevation": ("Max Elevation (m)", "max_elevation", "int"),
+    "avg_cadence": ("Avg Cadence (rpm)", "avg_cadence", "int"),
+    "max_cadence": ("Max Cadence (rpm)", "max_cadence", "int"),
+    "calories": ("Calories", "calories", "int"),
+}
+
+
+def get_activity_columns(
+    session: dict, types_filter: Optional[frozenset[str]], filtered: list[ActivityRow]
+) -> tuple[dict[str, np.ndarray], Optional[list[int]]]:
+    """
+    Get the activity columns and the positions matching a type filter.
+
+    Args:
+        session: Session data
+        types_filter: Activity types to include (optional)
+        filtered: Activities matching types_filter
+
+    Returns:
+        Tuple of (activity columns, positions of the filtered activities or None for all)
+    """
+    arrays = session.get("activity_columns")
+    if arrays is None:
+        return DataProcessor.to_columns(filtered), None
+
+    positions = None
+    if types_filter:
+        positions = DataProcessor.positions_for_types(
+            session.get("activities_by_type", {}), types_filter
+        )
+    return arrays, positions
+
+
+def _csv_values(values: np.ndarray, kind: str) -> list:
+    """
+    Format a whole activity column for the CSV export.
+
+    Args:
+        values: Column values, in row order
+        kind: Value kind from CSV_COLUMNS
+
+    Returns:
+        Cell values, None for missing values
+    """
+    if kind == "date":
+        return [value.strftime("%d/%m/%Y %H:%M") for value in values]
+    if kind == "text":
+        return values.tolist()
+
+    missing = np.isnan(values)
+    if kind == "int":
+        # Round to the nearest integer (half to even, like round())
+        values = np.where(missing, 0.0, np.rint(values)).astype(np.int64)
+    cells = values.tolist()
+    for i in np.flatnonzero(missing):
+        cells[i] = None
+    return cells
+
+
+def _rounded_total(value: Optional[float], ndigits: int):
+    """Round a total for display, leaving zero or missing totals blank."""
+    if not value:
+        return ""
+    return round(value, ndigits) if ndigits else int(round(value, 0))
+
+
+# Aggregations of the CSV totals row by column key (other columns are left blank)
+CSV_TOTALS = {
+    "duration": "duration",
+    "distance": "sum_km",
+    "avg_speed": "mean_1",
+    "max_speed": "max_1",
+    "avg_power": "mean",
+    "max_power": "max",
+    "avg_hr": "mean",
+    "max_hr": "max",
+    "total_ascent": "sum",
+    "max_elevation": "max",
+    "avg_cadence": "mean",
+    "max_cadence": "max",
+    "calories": "sum",
+}
+
+# Aggregation functions, applied to the non-missing cell values of a column
+_TOTAL_OPS = {
+    "sum": lambda values: _rounded_total(sum(values), 0),
+    "sum_km": lambda values: round(sum(values), 2) if values else "",
+    "mean": lambda values: _rounded_total(sum(values) / len(values) if values else None, 0),
+    "mean_1": lambda values: _rounded_total(sum(values) / len(values) if values else None, 1),
+    "max": lambda values: _rounded_total(max(values, default=None), 0),
+    "max_1": lambda values: _rounded_total(max(values, default=None), 1),
+}
+
+
+def _csv_totals(export_columns_list: list[tuple], total_duration: float) -> list:
+    """
+    Build the CSV totals row.
+
+    Args:
+        export_columns_list: List of (label, cell values, total aggregation) tuples
+        total_duration: Total duration of the exported activities in seconds
+
+    Returns:
+        Totals row, starting with the TOTAL label
+    """
+    totals = []
+    for _, cells, op in export_columns_list:
+        if op is None:
+            totals.append("")
+        elif op == "duration":
+            totals.append(DataProcessor.format_duration(total_duration))
         else:
-            totals[label] = ""
+            totals.append(_TOTAL_OPS[op]([value for value in cells if value is not None]))
+    totals[0] = "TOTAL"
+    return totals
+
+
+def _csv_rows(export_columns_list: list[tuple], totals: list):
+    """
+    Stream CSV lines for the given columns, followed by the totals row.
+
+    Rows are yielded in batches of CSV_CHUNK_ROWS to keep the number of chunks low.
+
+    Args:
+        export_columns_list: List of (label, cell values, total aggregation) tuples
+        totals: Totals row, as built by _csv_totals
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
 
-    # Append totals row with columns in same order as df_export
-    totals_df = pd.DataFrame([totals], columns=df_export.columns)
-    df_export = pd.concat([df_export, totals_df], ignore_index=True)
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow([label for label, _, _ in export_columns_list])
+    yield flush()
+
+    for n, row in enumerate(zip(*(cells for _, cells, _ in export_columns_list)), 1):
+        writer.writerow(row)
+        if n % CSV_CHUNK_ROWS == 0:
+            yield flush()
+
+    writer.writerow(totals)
+    yield flush()
+
+
+@router.get("/csv")
+def export_csv(
+    bundle: ExportBundle = Depends(export_bundle),
+    columns: Optional[str] = Query(None, description="Comma-separated column keys to export"),
+):
+    """
+    Export activities to CSV.
+
+    A plain def, so FastAPI runs it in the threadpool: formatting the rows is
+    CPU-bound and would otherwise block the event loop.
+
+    Args:
+        bundle: Activities to export
+        columns: Comma-separated list of column keys to export
+
+    Returns:
+        CSV file
+    """
+    filtered = bundle.filtered
+
+    # Format each selected column at once from the activity columns
+    arrays, positions = get_activity_columns(bundle.session, bundle.types_filter, filtered)
+    selected_keys = parse_column_keys(columns)
+    formatted = {}
+    for key, (label, field, kind) in CSV_COLUMNS.items():
+        if selected_keys is None or key in selected_keys:
+            values = arrays[field] if positions is None else arrays[field][positions]
+            formatted[key] = (label, _csv_values(values, kind), CSV_TOTALS.get(key))
+
+    # Keep CSV_COLUMNS order, skipping columns with no data (all null or 0)
+    export_columns_list = resolve_export_columns(
+        formatted, None, lambda key: any(value not in (None, 0) for value in formatted[key][1])
+    )
 
-    # Generate CSV
-    csv_buffer = io.StringIO()
-    df_export.to_csv(csv_buffer, index=False)
-    csv_buffer.seek(0)
+    if not export_columns_list:
+        raise HTTPException(status_code=404, detail="No data to export with selected columns")
 
     # Create filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -184,188 +324,382 @@ async def export_csv(
 
     logger.info(f"Exported {len(filtered)} activities to CSV")
 
-    return StreamingResponse(
-        iter([csv_buffer.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    totals = _csv_totals(export_columns_list, bundle.summary.total_duration)
+    rows = _csv_rows(export_columns_list, totals)
+
+    # Small exports are sent in one piece with a Content-Length; large ones are streamed
+    if len(filtered) <= CSV_STREAM_THRESHOLD_ROWS:
+        content = "".join(rows)
+        return Response(content=content, media_type="text/csv", headers=headers)
+
+    return StreamingResponse(rows, media_type="text/csv", headers=headers)
+
+
+# PDF column keys mapped to (DataFrame column, label)
+# Order matches frontend availableColumns array
+PDF_COLUMNS = {
+    "start_time": ("start_time", "Date"),
+    "activity_name": ("activity_name", "Activity"),
+    "activity_type": ("activity_type", "Type"),
+    "duration": ("duration_formatted", "Duration"),
+    "distance": ("distance_km", "Distance\n(km)"),
+    "avg_speed": ("avg_speed_kmh", "Avg Speed\n(km/h)"),
+    "max_speed": ("max_speed_kmh", "Max Speed\n(km/h)"),
+    "avg_power": ("avg_power", "Avg Power\n(W)"),
+    "max_power": ("max_power", "Max Power\n(W)"),
+    "avg_hr": ("avg_hr", "Avg HR\n(bpm)"),
+    "max_hr": ("max_hr", "Max HR\n(bpm)"),
+    "total_ascent": ("total_ascent", "Elevation\n(m)"),
+    "max_elevation": ("max_elevation", "Max Elev\n(m)"),
+    "avg_cadence": ("avg_cadence", "Avg Cadence\n(rpm)"),
+    "max_cadence": ("max_cadence", "Max Cadence\n(rpm)"),
+    "calories": ("calories", "Calories"),
+}
+
+# Activity fields needed to render any PDF column selection
+PDF_DATAFRAME_COLUMNS = frozenset(df_col for df_col, _ in PDF_COLUMNS.values())
+
+# PDF table column widths in points by DataFrame column, fitting the header and usual values
+PDF_COLUMN_WIDTHS = {
+    "start_time": 76,
+    "activity_name": 90,
+    "activity_type": 94,
+    "duration_formatted": 54,
+    "distance_km": 56,
+    "avg_speed_kmh": 66,
+    "max_speed_kmh": 66,
+    "avg_power": 66,
+    "max_power": 66,
+    "avg_hr": 50,
+    "max_hr": 50,
+    "total_ascent": 58,
+    "max_elevation": 56,
+    "avg_cadence": 78,
+    "max_cadence": 78,
+    "calories": 54,
+}
+
+# PDF table row heights in points for the table style (header rows grow per label line)
+PDF_ROW_HEIGHT = 18
+PDF_HEADER_HEIGHT = 27
+PDF_HEADER_LINE_HEIGHT = 12
+
+# Default padding of the SimpleDocTemplate page frame, in points
+PDF_FRAME_PADDING = 6
+
+# Type filters whose PDF DataFrames are memoized per session (each holds a whole DataFrame)
+PDF_DATAFRAME_CACHE_SIZE = 4
+
+# Text columns truncated in the PDF table to keep it within the page width, to at most
+# PDF_TEXT_MAX_LENGTH characters and then to what fits their column at the body font
+PDF_TRUNCATED_COLUMNS = frozenset({"activity_name", "activity_type"})
+PDF_TEXT_MAX_LENGTH = 20
+
+# PDF table body font (ReportLab's default table font), font sizes and default
+# horizontal cell padding, in points
+PDF_BODY_FONT = "Helvetica"
+PDF_HEADER_FONT_SIZE = 10
+PDF_BODY_FONT_SIZE = 8
+PDF_CELL_PADDING = 6
+
+
+def _columns_with_data(df: pd.DataFrame) -> dict[str, bool]:
+    """
+    Tell for each column whether it has data (a value other than null or 0).
 
+    Args:
+        df: DataFrame to check
 
-@router.get("/pdf")
-async def export_pdf(
-    request: Request,
-    activity_types: Optional[str] = Query(None, description="Comma-separated activity types"),
-    columns: Optional[str] = Query(None, description="Comma-separated column keys to export"),
-):
+    Returns:
+        Mapping of column name to whether it has data
     """
-    Export activities to PDF.
+    has_data = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series):
+            has_data[column] = bool(np.any(series.to_numpy(dtype=float, na_value=0.0) != 0))
+        else:
+            has_data[column] = bool(series.notna().any())
+    return has_data
+
+
+def _fit_pdf_text(text: str, width: float) -> str:
+    """
+    Truncate a PDF table cell text so it fits its column.
 
     Args:
-        activity_types: Comma-separated list of activity types to filter
-        columns: Comma-separated list of column keys to export
+        text: Cell text
+        width: Column width in points
 
     Returns:
-        PDF file
+        Text cut to PDF_TEXT_MAX_LENGTH characters and to the column's inner width
     """
-    session = get_session_data(request)
-    activities = session.get("activities", [])
+    text = text[:PDF_TEXT_MAX_LENGTH]
+    available = width - 2 * PDF_CELL_PADDING
+    while text and stringWidth(text, PDF_BODY_FONT, PDF_BODY_FONT_SIZE) > available:
+        text = text[:-1]
+    return text
 
-    if not activities:
-        raise HTTPException(status_code=404, detail="No activities found")
 
-    # Parse activity types filter
-    types_filter = None
-    if activity_types:
-        types_filter = [t.strip() for t in activity_types.split(",")]
+def get_pdf_dataframe(
+    session: dict, types_filter: Optional[frozenset[str]], filtered: list[ActivityRow]
+) -> tuple[pd.DataFrame, dict[str, bool]]:
+    """
+    Get the formatted DataFrame of the PDF columns for a filter, memoized in the session.
 
-    # Filter activities
-    filtered = DataProcessor.filter_activities(activities, activity_types=types_filter)
+    Keyed like get_filtered_activities, so repeated exports of an unchanged
+    activity list skip the DataFrame construction. The cached frame must not
+    be modified.
 
-    if not filtered:
-        raise HTTPException(status_code=404, detail="No activities match the filter")
+    Args:
+        session: Session data
+        types_filter: Activity types to include (optional)
+        filtered: Activities matching types_filter
+
+    Returns:
+        Tuple of (DataFrame with the PDF_COLUMNS fields, has-data mask by column)
+    """
+    types_key = tuple(sorted(types_filter)) if types_filter else None
+    key = (session.get("activities_version", ""), types_key)
+    cache = session.get("dataframe_cache")
+    if cache is None:
+        cache = session["dataframe_cache"] = LRUCache(PDF_DATAFRAME_CACHE_SIZE)
+
+    cached = cache.get(key)
+    if cached is None:
+        # Slice the session's activity columns instead of reading every activity
+        arrays, positions = get_activity_columns(session, types_filter, filtered)
+        df = DataProcessor.columns_to_dataframe(arrays, positions, PDF_DATAFRAME_COLUMNS)
+        cached = (df, _columns_with_data(df))
+        cache.set(key, cached)
+
+    return cached
+
+
+def _pdf_table(
+    session: dict,
+    types_filter: Optional[frozenset[str]],
+    filtered: list[ActivityRow],
+    columns: Optional[str],
+) -> tuple[list[list[str]], list[float]]:
+    """
+    Build the PDF table rows and column widths for the selected columns.
+
+    Args:
+        session: Session data
+        types_filter: Activity types to include (optional)
+        filtered: Activities matching types_filter
+        columns: Comma-separated list of column keys to export (optional)
+
+    Returns:
+        Tuple of (table rows with the header row first, column widths)
 
-    # Calculate summary
-    summary = DataProcessor.calculate_summary(filtered)
-
-    # Convert to DataFrame with proper formatting
-    df = DataProcessor.activities_to_dataframe(filtered)
-
-    # Map frontend column keys to DataFrame column names
-    # Order matches frontend availableColumns array
-    column_mapping = {
-        "start_time": ("start_time", "Date"),
-        "activity_name": ("activity_name", "Activity"),
-        "activity_type": ("activity_type", "Type"),
-        "duration": ("duration_formatted", "Duration"),
-        "distance": ("distance_km", "Distance\n(km)"),
-        "avg_speed": ("avg_speed_kmh", "Avg Speed\n(km/h)"),
-        "max_speed": ("max_speed_kmh", "Max Speed\n(km/h)"),
-        "avg_power": ("avg_power", "Avg Power\n(W)"),
-        "max_power": ("max_power", "Max Power\n(W)"),
-        "avg_hr": ("avg_hr", "Avg HR\n(bpm)"),
-        "max_hr": ("max_hr", "Max HR\n(bpm)"),
-        "total_ascent": ("total_ascent", "Elevation\n(m)"),
-        "max_elevation": ("max_elevation", "Max Elev\n(m)"),
-        "avg_cadence": ("avg_cadence", "Avg Cadence\n(rpm)"),
-        "max_cadence": ("max_cadence", "Max Cadence\n(rpm)"),
-        "calories": ("calories", "Calories"),
-    }
-
-    # Parse selected columns
-    selected_keys = None
-    if columns:
-        selected_keys = [c.strip() for c in columns.split(",")]
-
-    # Build export columns list maintaining order from column_mapping
-    export_columns_list = []
-
-    # If columns are selected, reorder them to match column_mapping order
-    if selected_keys:
-        selected_set = set(selected_keys)
-        ordered_keys = [key for key in column_mapping.keys() if key in selected_set]
-    else:
-        ordered_keys = list(column_mapping.keys())
-
-    for key in ordered_keys:
-        if key not in column_mapping:
-            continue
-        df_col, label = column_mapping[key]
-        # Skip if column doesn't exist in DataFrame
-        if df_col not in df.columns:
-            continue
-        # Skip if column has no data (all null or 0)
-        if df[df_col].notna().sum() == 0 or (df[df_col].fillna(0) == 0).all():
-            continue
-        export_columns_list.append((df_col, label))
+    Raises:
+        HTTPException: 404 if none of the selected columns has data
+    """
+    # Formatted DataFrame for the filter, shared by PDF exports with other column choices
+    df, has_data = get_pdf_dataframe(session, types_filter, filtered)
+
+    # Selected columns in PDF_COLUMNS order, skipping columns with no data (all null or 0)
+    export_columns_list = resolve_export_columns(
+        PDF_COLUMNS,
+        parse_column_keys(columns),
+        lambda key: has_data.get(PDF_COLUMNS[key][0], False),
+    )
 
     if not export_columns_list:
         raise HTTPException(status_code=404, detail="No data to export with selected columns")
 
+    # Pull each column out once, with its missing-value mask, instead of indexing cell by cell
+    col_widths = [PDF_COLUMN_WIDTHS[df_col] for df_col, _ in export_columns_list]
+    column_arrays = []
+    for (df_col, _), width in zip(export_columns_list, col_widths):
+        values = df[df_col].to_numpy(dtype=object)
+        missing = pd.isna(values)
+        if df_col in PDF_TRUNCATED_COLUMNS:
+            values = [
+                None if is_missing else _fit_pdf_text(str(value), width)
+                for value, is_missing in zip(values, missing)
+            ]
+        column_arrays.append((values, missing))
+
+    # Activities table - header row from selected columns, then one row per activity
+    header_row = [label for _, label in export_columns_list]
+    table_data = [header_row] + [
+        ["-" if missing[idx] else str(values[idx]) for values, missing in column_arrays]
+        for idx in range(len(df))
+    ]
+    return table_data, col_widths
+
+
+# Report styles, built once per process instead of on every render
+PDF_STYLES = getSampleStyleSheet()
+PDF_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), PDF_HEADER_FONT_SIZE),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("FONTNAME", (0, 1), (-1, -1), PDF_BODY_FONT),
+        ("FONTSIZE", (0, 1), (-1, -1), PDF_BODY_FONT_SIZE),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ]
+)
+
+
+def _build_pdf(
+    table_data: list[list[str]],
+    col_widths: list[float],
+    summary: dict,
+    start_date: datetime,
+    end_date: datetime,
+) -> bytes:
+    """
+    Render the activities report to PDF.
+
+    Runs in a worker process, so it only takes plain picklable arguments.
+
+    Args:
+        table_data: Table rows, header row first
+        col_widths: Table column widths in points
+        summary: Dumped ActivitySummary
+        start_date: Start of the reported period
+        end_date: End of the reported period
+
+    Returns:
+        PDF file content
+    """
     # Create PDF in memory
     pdf_buffer = io.BytesIO()
     doc = SimpleDocTemplate(pdf_buffer, pagesize=landscape(A4))
     elements = []
 
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = styles["Title"]
-    normal_style = styles["Normal"]
-
     # Title
-    title = Paragraph("BikeStat - Cycling Activities Report", title_style)
+    title = Paragraph("BikeStat - Cycling Activities Report", PDF_STYLES["Title"])
     elements.append(title)
     elements.append(Spacer(1, 0.2 * inch))
 
     # Date range
-    start_date = session.get("start_date")
-    end_date = session.get("end_date")
     date_text = f"Period: {start_date.strftime('%d/%m/%Y')} to {end_date.strftime('%d/%m/%Y')}"
-    elements.append(Paragraph(date_text, normal_style))
+    elements.append(Paragraph(date_text, PDF_STYLES["Normal"]))
     elements.append(Spacer(1, 0.2 * inch))
 
     # Summary section
+    avg_speed = summary["avg_speed"]
     summary_text = f"""
     <b>Summary Statistics</b><br/>
-    Total Activities: {summary.total_activities}<br/>
-    Total Distance: {summary.total_distance / 1000:.2f} km<br/>
-    Total Duration: {int(summary.total_duration // 3600):02d}:{int((summary.total_duration % 3600) // 60):02d}<br/>
-    Average Speed: {summary.avg_speed * 3.6 if summary.avg_speed else 0:.1f} km/h<br/>
-    Total Calories: {summary.total_calories or 0}
+    Total Activities: {summary["total_activities"]}<br/>
+    Total Distance: {summary["total_distance"] / 1000:.2f} km<br/>
+    Total Duration: {DataProcessor.format_duration(summary["total_duration"])}<br/>
+    Average Speed: {avg_speed * 3.6 if avg_speed else 0:.1f} km/h<br/>
+    Total Calories: {summary["total_calories"] or 0}
     """
-    elements.append(Paragraph(summary_text, normal_style))
+    elements.append(Paragraph(summary_text, PDF_STYLES["Normal"]))
     elements.append(Spacer(1, 0.3 * inch))
 
-    # Activities table - build header row from selected columns
-    header_row = [label for _, label in export_columns_list]
-    table_data = [header_row]
-
-    # Add data rows from DataFrame
-    for idx in range(len(df)):
-        row = []
-        for df_col, _ in export_columns_list:
-            value = df[df_col].iloc[idx]
-            # Handle NaN/None values
-            if pd.isna(value):
-                row.append("-")
-            # Truncate long text fields
-            elif df_col in ["activity_name", "activity_type"]:
-                row.append(str(value)[:20] if len(str(value)) > 20 else str(value))
-            else:
-                row.append(str(value))
-        table_data.append(row)
-
-    # Create table
-    table = Table(table_data, repeatRows=1)
-    table.setStyle(
-        TableStyle(
+    # Activities table, as one table per page: ReportLab splits a long table page by
+    # page, copying every remaining row each time, which grows quadratically with rows.
+    # Explicit sizes spare ReportLab from measuring every cell of every row.
+    header_row, rows = table_data[0], table_data[1:]
+    header_lines = max(label.count("\n") for label in header_row) + 1
+
+    # Scale column selections wider than the page frame down to fit it, with their
+    # text and padding, so cells keep the same fit instead of spilling off the page
+    scale = min(1.0, (doc.width - 2 * PDF_FRAME_PADDING) / sum(col_widths))
+    col_widths = [width * scale for width in col_widths]
+    fit_style = None
+    if scale < 1.0:
+        fit_style = TableStyle(
             [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 10),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ("FONTSIZE", (0, 1), (-1, -1), 8),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ("FONTSIZE", (0, 0), (-1, 0), PDF_HEADER_FONT_SIZE * scale),
+                ("FONTSIZE", (0, 1), (-1, -1), PDF_BODY_FONT_SIZE * scale),
+                ("LEFTPADDING", (0, 0), (-1, -1), PDF_CELL_PADDING * scale),
+                ("RIGHTPADDING", (0, 0), (-1, -1), PDF_CELL_PADDING * scale),
             ]
         )
+    header_height = PDF_HEADER_HEIGHT + (header_lines - 1) * PDF_HEADER_LINE_HEIGHT
+
+    # Rows fitting below the report header on the first page, then on a full page
+    frame_height = doc.height - 2 * PDF_FRAME_PADDING
+    used_height = sum(
+        element.wrap(doc.width, frame_height)[1]
+        + element.getSpaceBefore()
+        + element.getSpaceAfter()
+        for element in elements
     )
-    elements.append(table)
+    first_page_rows = max(int((frame_height - used_height - header_height) // PDF_ROW_HEIGHT), 0)
+    page_rows = max(int((frame_height - header_height) // PDF_ROW_HEIGHT), 1)
+
+    start = 0
+    while start < len(rows):
+        end = start + (first_page_rows if start == 0 and first_page_rows else page_rows)
+        chunk = rows[start:end]
+        table = Table(
+            [header_row] + chunk,
+            colWidths=col_widths,
+            rowHeights=[header_height] + [PDF_ROW_HEIGHT] * len(chunk),
+            repeatRows=1,
+        )
+        table.setStyle(PDF_TABLE_STYLE)
+        if fit_style is not None:
+            table.setStyle(fit_style)
+        elements.append(table)
+        start = end
 
     # Build PDF
     doc.build(elements)
-    pdf_buffer.seek(0)
+
+    return pdf_buffer.getvalue()
+
+
+@router.get("/pdf")
+async def export_pdf(
+    request: Request,
+    bundle: ExportBundle = Depends(export_bundle),
+    columns: Optional[str] = Query(None, description="Comma-separated column keys to export"),
+):
+    """
+    Export activities to PDF.
+
+    Args:
+        bundle: Activities to export
+        columns: Comma-separated list of column keys to export
+
+    Returns:
+        PDF file
+    """
+    session = bundle.session
+
+    # Build the table rows in a thread, the pandas work would block the event loop
+    table_data, col_widths = await asyncio.to_thread(
+        _pdf_table, session, bundle.types_filter, bundle.filtered, columns
+    )
+
+    # Render the PDF in a worker process so the event loop stays responsive
+    loop = asyncio.get_running_loop()
+    pdf_bytes = await loop.run_in_executor(
+        request.app.state.cpu_pool,
+        _build_pdf,
+        table_data,
+        col_widths,
+        bundle.summary.model_dump(),
+        session.get("start_date"),
+        session.get("end_date"),
+    )
 
     # Create filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"bikestat_activities_{timestamp}.pdf"
 
-    logger.info(f"Exported {len(filtered)} activities to PDF")
+    logger.info(f"Exported {len(bundle.filtered)} activities to PDF")
 
-    return StreamingResponse(
-        pdf_buffer,
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -0,0 +1,34 @@
+"""Authentication middleware."""
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from backend.services import SessionManager
+
+# Paths that require an authenticated session
+PROTECTED_PREFIXES = ("/activities/", "/export/")
+
+
+class AuthRequiredMiddleware(BaseHTTPMiddleware):
+    """
+    Reject unauthenticated requests to protected paths before routing.
+
+    The resolved session is stored on request.state.session so endpoints and
+    later middleware don't look it up again.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if not request.url.path.startswith(PROTECTED_PREFIXES):
+            return await call_next(request)
+
+        session_id = request.cookies.get("session_id")
+        if not session_id:
+            return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+
+        session_manager: SessionManager = request.app.state.session_manager
+        session = await session_manager.resolve_session(session_id)
+        if not session:
+            return JSONResponse({"detail": "Session expired"}, status_code=401)
+
+        request.state.session = session
+        return await call_next(request)
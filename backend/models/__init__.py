@@ -1,5 +1,5 @@
 """Data models for the application."""
 
-from .activity import Activity, ActivitySummary, DateRange, FilterOptions
+from .activity import Activity, ActivityRow, ActivitySummary, DateRange, FetchQuery, FilterOptions
 
-__all__ = ["Activity", "ActivitySummary", "DateRange", "FilterOptions"]
+__all__ = ["Activity", "ActivityRow", "ActivitySummary", "DateRange", "FetchQuery", "FilterOptions"]
@@ -1,8 +1,9 @@
 """Activity data models."""
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Activity(BaseModel):
@@ -26,6 +27,10 @@ class Activity(BaseModel):
     avg_cadence: Optional[float] = Field(None, description="Average cadence in rpm")
     max_cadence: Optional[float] = Field(None, description="Max cadence in rpm")
     calories: Optional[int] = Field(None, description="Total calories burned")
+    duration_formatted: Optional[str] = Field(None, description="Duration as HH:MM")
+    distance_km: Optional[float] = Field(None, description="Distance in km (2 decimals)")
+    avg_speed_kmh: Optional[float] = Field(None, description="Average speed in km/h (1 decimal)")
+    max_speed_kmh: Optional[float] = Field(None, description="Max speed in km/h (1 decimal)")
 
     class Config:
         json_schema_extra = {
@@ -42,6 +47,55 @@ class Activity(BaseModel):
         }
 
 
+@dataclass(slots=True)
+class ActivityRow:
+    """
+    Compact activity record used for in-memory processing.
+
+    Same fields as Activity, without pydantic validation or a per-instance
+    dict. Activities are parsed into rows and kept in the session that way;
+    Activity remains the API schema.
+    """
+
+    activity_id: str
+    activity_name: str
+    activity_type: str
+    start_time: datetime
+    duration: float
+    distance: float
+    avg_speed: Optional[float] = None
+    max_speed: Optional[float] = None
+    avg_power: Optional[float] = None
+    max_avg_power: Optional[float] = None
+    max_power: Optional[float] = None
+    avg_hr: Optional[float] = None
+    max_hr: Optional[float] = None
+    total_ascent: Optional[float] = None
+    max_elevation: Optional[float] = None
+    avg_cadence: Optional[float] = None
+    max_cadence: Optional[float] = None
+    calories: Optional[int] = None
+    duration_formatted: Optional[str] = None
+    distance_km: Optional[float] = None
+    avg_speed_kmh: Optional[float] = None
+    max_speed_kmh: Optional[float] = None
+
+
+# Activity field names, for reading activities attribute by attribute without model_dump
+ACTIVITY_FIELDS = tuple(Activity.model_fields)
+
+# Summary fields combined by weighted average / by max when merging summaries
+SUMMARY_AVG_FIELDS = ("avg_speed", "avg_power", "avg_hr", "avg_cadence")
+SUMMARY_MAX_FIELDS = (
+    "max_speed",
+    "max_avg_power",
+    "max_power",
+    "max_hr",
+    "max_elevation",
+    "max_cadence",
+)
+
+
 class ActivitySummary(BaseModel):
     """Summary statistics for multiple activities."""
 
@@ -61,6 +115,55 @@ class ActivitySummary(BaseModel):
     max_cadence: Optional[float] = Field(None, description="Maximum cadence")
     total_calories: Optional[int] = Field(None, description="Total calories burned")
 
+    # Number of non-null values behind each averaged field, used to merge summaries
+    _value_counts: dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def merge(cls, partials: list["ActivitySummary"]) -> "ActivitySummary":
+        """
+        Combine summaries of disjoint activity sets into one summary.
+
+        Totals are summed, maxima take the max, and averages are weighted by the
+        number of values behind each partial average.
+
+        Args:
+            partials: Summaries to combine
+
+        Returns:
+            Combined ActivitySummary
+        """
+        if not partials:
+            return cls(total_activities=0, total_duration=0.0, total_distance=0.0)
+
+        values = {
+            "total_activities": sum(p.total_activities for p in partials),
+            "total_duration": sum(p.total_duration for p in partials),
+            "total_distance": sum(p.total_distance for p in partials),
+        }
+        counts = {}
+
+        for field in SUMMARY_AVG_FIELDS:
+            weighted = [
+                (getattr(p, field), p._value_counts.get(field, 0))
+                for p in partials
+                if getattr(p, field) is not None
+            ]
+            count = sum(n for _, n in weighted)
+            values[field] = sum(v * n for v, n in weighted) / count if count else None
+            counts[field] = count
+
+        for field in SUMMARY_MAX_FIELDS:
+            maxes = [getattr(p, field) for p in partials if getattr(p, field) is not None]
+            values[field] = max(maxes) if maxes else None
+
+        ascents = [p.total_ascent for p in partials if p.total_ascent is not None]
+        values["total_ascent"] = sum(ascents) if ascents else None
+        values["total_calories"] = sum(p.total_calories or 0 for p in partials)
+
+        merged = cls.model_construct(**values)
+        merged._value_counts = counts
+        return merged
+
 
 class DateRange(BaseModel):
     """Date range for filtering activities."""
@@ -69,6 +172,13 @@ class DateRange(BaseModel):
     end_date: datetime
 
 
+class FetchQuery(BaseModel):
+    """Query parameters for fetching activities."""
+
+    start_date: Optional[datetime] = Field(None, description="Start date (ISO format)")
+    end_date: Optional[datetime] = Field(None, description="End date (ISO format)")
+
+
 class FilterOptions(BaseModel):
     """Filter options for activities."""
 
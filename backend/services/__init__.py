@@ -1,7 +1,14 @@
 """Services for the application."""
 
 from .session import SessionManager
+from .session_backend import SessionBackend, connect_session_backend
 from .garmin import GarminService
 from .data_processor import DataProcessor
 
-__all__ = ["SessionManager", "GarminService", "DataProcessor"]
+__all__ = [
+    "SessionManager",
+    "SessionBackend",
+    "connect_session_backend",
+    "GarminService",
+    "DataProcessor",
+]
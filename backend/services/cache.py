@@ -0,0 +1,137 @@
+"""In-memory caches."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Build a cache key from request parameters.
+
+    Args:
+        parts: Parameters identifying the cached response
+
+    Returns:
+        Hex digest of the parameters
+    """
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class AsyncTTLCache:
+    """Cache whose entries expire a fixed time after they are stored."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        """
+        Initialize TTL cache.
+
+        Args:
+            ttl_seconds: Lifetime of an entry in seconds
+            max_entries: Number of entries kept before the oldest are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl_seconds: Lifetime of this entry in seconds (optional, defaults to the cache's)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        async with self._lock:
+            now = time.monotonic()
+            self._entries.pop(key, None)
+            self._entries[key] = (now + ttl, value)
+
+            if len(self._entries) > self.max_entries:
+                # Drop expired entries first, then the oldest ones (dicts keep insertion order)
+                self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+
+    async def clear(self) -> None:
+        """Remove every entry."""
+        async with self._lock:
+            self._entries.clear()
+
+
+class LRUCache:
+    """
+    Cache keeping only the most recently used entries.
+
+    Safe to share between the event loop and threadpool endpoints.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize LRU cache.
+
+        Args:
+            max_entries: Number of entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """
+        Get a cached value, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,24 +1,90 @@
 """Data processing service for activities."""
 
+import heapq
+from collections import defaultdict
+from collections.abc import Collection
 from datetime import datetime
 from typing import Optional
+import numpy as np
 import pandas as pd
-from backend.models.activity import Activity, ActivitySummary
+from backend.models.activity import (
+    ACTIVITY_FIELDS,
+    SUMMARY_AVG_FIELDS,
+    SUMMARY_MAX_FIELDS,
+    ActivityRow,
+    ActivitySummary,
+)
+
+# Metrics exported as integers (no decimals)
+INTEGER_COLUMNS = (
+    "total_ascent",
+    "max_elevation",
+    "avg_hr",
+    "max_hr",
+    "avg_cadence",
+    "max_cadence",
+    "avg_power",
+    "max_power",
+    "calories",
+)
+
+# Numeric activity fields, stored as float arrays (NaN for missing values) by to_columns
+NUMERIC_FIELDS = frozenset(
+    {
+        "duration",
+        "distance",
+        "avg_speed",
+        "max_speed",
+        "avg_power",
+        "max_avg_power",
+        "max_power",
+        "avg_hr",
+        "max_hr",
+        "total_ascent",
+        "max_elevation",
+        "avg_cadence",
+        "max_cadence",
+        "calories",
+        "distance_km",
+        "avg_speed_kmh",
+        "max_speed_kmh",
+    }
+)
+
+# Activity fields read by the summary calculations
+SUMMARY_SOURCE_FIELDS = (
+    ("duration", "distance", "total_ascent", "calories") + SUMMARY_AVG_FIELDS + SUMMARY_MAX_FIELDS
+)
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert an optional Garmin metric to float."""
+    return None if value is None else float(value)
+
+
+def _column_dtype(field: str) -> type:
+    """Get the array dtype used for an activity field by to_columns."""
+    return np.float64 if field in NUMERIC_FIELDS else object
 
 
 class DataProcessor:
     """Process and transform Garmin activity data."""
 
     @staticmethod
-    def parse_activity(raw_activity: dict) -> Activity:
+    def format_duration(seconds: float) -> str:
+        """Format a duration in seconds as HH:MM (without seconds)."""
+        return f"{int(seconds // 3600):02d}:{int((seconds % 3600) // 60):02d}"
+
+    @staticmethod
+    def parse_activity(raw_activity: dict) -> ActivityRow:
         """
-        Parse raw Garmin activity data into Activity model.
+        Parse raw Garmin activity data into an activity row.
 
         Args:
             raw_activity: Raw activity data from Garmin API
 
         Returns:
-            Activity model instance
+            ActivityRow instance
         """
         # Extract basic info
         activity_id = str(raw_activity.get("activityId", ""))
@@ -28,44 +94,47 @@ class DataProcessor:
         # Parse start time
         start_time_str = raw_activity.get("startTimeLocal", "")
         try:
-            start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
+            start_time = datetime.fromisoformat(start_time_str)
+        except (ValueError, TypeError):
             start_time = datetime.now()
 
         # Extract metrics with safe defaults
-        duration = raw_activity.get("duration", 0.0)
-        distance = raw_activity.get("distance", 0.0)
+        duration = float(raw_activity.get("duration") or 0.0)
+        distance = float(raw_activity.get("distance") or 0.0)
 
         # Speed metrics (convert from km/h to m/s if needed)
-        avg_speed = raw_activity.get("averageSpeed")
-        max_speed = raw_activity.get("maxSpeed")
+        avg_speed = _to_float(raw_activity.get("averageSpeed"))
+        max_speed = _to_float(raw_activity.get("maxSpeed"))
 
         # Power metrics
-        avg_power = raw_activity.get("avgPower")
-        max_avg_power = raw_activity.get("maxAvgPower")
-        max_power = raw_activity.get("maxPower")
+        avg_power = _to_float(raw_activity.get("avgPower"))
+        max_avg_power = _to_float(raw_activity.get("maxAvgPower"))
+        max_power = _to_float(raw_activity.get("maxPower"))
 
         # Heart rate metrics
-        avg_hr = raw_activity.get("averageHR")
-        max_hr = raw_activity.get("maxHR")
+        avg_hr = _to_float(raw_activity.get("averageHR"))
+        max_hr = _to_float(raw_activity.get("maxHR"))
 
         # Elevation metrics
-        total_ascent = raw_activity.get("elevationGain")
-        max_elevation = raw_activity.get("maxElevation")
+        total_ascent = _to_float(raw_activity.get("elevationGain"))
+        max_elevation = _to_float(raw_activity.get("maxElevation"))
 
         # Cadence metrics
         avg_cadence = raw_activity.get("averageBikingCadenceInRevPerMinute")
         if avg_cadence is None:
             avg_cadence = raw_activity.get("avgBikeCadence")
+        avg_cadence = _to_float(avg_cadence)
 
         max_cadence = raw_activity.get("maxBikingCadenceInRevPerMinute")
         if max_cadence is None:
             max_cadence = raw_activity.get("maxBikeCadence")
+        max_cadence = _to_float(max_cadence)
 
         # Calories
         calories = raw_activity.get("calories")
+        calories = int(calories) if calories is not None else None
 
-        return Activity(
+        return ActivityRow(
             activity_id=activity_id,
             activity_name=activity_name,
             activity_type=activity_type,
@@ -84,85 +153,191 @@ class DataProcessor:
             avg_cadence=avg_cadence,
             max_cadence=max_cadence,
             calories=calories,
+            # Display values precomputed once for the exports
+            duration_formatted=DataProcessor.format_duration(duration),
+            distance_km=round(distance / 1000, 2),
+            avg_speed_kmh=round(avg_speed * 3.6, 1) if avg_speed is not None else None,
+            max_speed_kmh=round(max_speed * 3.6, 1) if max_speed is not None else None,
         )
 
     @staticmethod
-    def calculate_summary(activities: list[Activity]) -> ActivitySummary:
+    def parse_activities(raw_activities: list[dict]) -> list[ActivityRow]:
+        """
+        Parse a batch of raw Garmin activities.
+
+        Args:
+            raw_activities: Raw activity data from Garmin API
+
+        Returns:
+            List of ActivityRow instances
+        """
+        return [DataProcessor.parse_activity(raw) for raw in raw_activities]
+
+    @staticmethod
+    def to_columns(
+        activities: list[ActivityRow], fields: Collection[str] = ACTIVITY_FIELDS
+    ) -> dict[str, np.ndarray]:
+        """
+        Convert activities to one array per field (structure of arrays).
+
+        Numeric fields become float arrays with NaN for missing values, so
+        summaries and exports work on contiguous columns instead of objects.
+
+        Args:
+            activities: List of ActivityRow instances
+            fields: Fields to convert (optional, defaults to all)
+
+        Returns:
+            Mapping of field name to array, in activity order
+        """
+        return {
+            field: np.array([getattr(a, field) for a in activities], dtype=_column_dtype(field))
+            for field in fields
+        }
+
+    @staticmethod
+    def calculate_summary_from_columns(
+        arrays: dict[str, np.ndarray], positions: Optional[np.ndarray] = None
+    ) -> ActivitySummary:
         """
-        Calculate summary statistics from activities.
+        Calculate summary statistics from activity columns.
 
         Args:
-            activities: List of Activity instances
+            arrays: Activity columns, as built by to_columns
+            positions: Positions of the activities to summarize (optional, defaults to all)
 
         Returns:
             ActivitySummary instance
         """
-        if not activities:
+
+        def present(field: str) -> np.ndarray:
+            values = arrays[field] if positions is None else arrays[field][positions]
+            return values[~np.isnan(values)]
+
+        total_activities = len(arrays["duration"]) if positions is None else len(positions)
+        if total_activities == 0:
             return ActivitySummary(
                 total_activities=0,
                 total_duration=0.0,
                 total_distance=0.0,
             )
 
-        # Convert to DataFrame for easier calculations
-        data = [activity.model_dump() for activity in activities]
-        df = pd.DataFrame(data)
-
-        # Calculate totals
-        total_activities = len(activities)
-        total_duration = df["duration"].sum()
-        total_distance = df["distance"].sum()
-
-        # Calculate averages (only from non-null values)
-        def safe_mean(column: str) -> Optional[float]:
-            values = df[column].dropna()
-            return float(values.mean()) if len(values) > 0 else None
-
-        def safe_max(column: str) -> Optional[float]:
-            values = df[column].dropna()
-            return float(values.max()) if len(values) > 0 else None
-
-        def safe_sum(column: str) -> Optional[float]:
-            values = df[column].dropna()
-            return float(values.sum()) if len(values) > 0 else None
-
-        return ActivitySummary(
-            total_activities=total_activities,
-            total_duration=total_duration,
-            total_distance=total_distance,
-            avg_speed=safe_mean("avg_speed"),
-            max_speed=safe_max("max_speed"),
-            avg_power=safe_mean("avg_power"),
-            max_avg_power=safe_max("max_avg_power"),
-            max_power=safe_max("max_power"),
-            avg_hr=safe_mean("avg_hr"),
-            max_hr=safe_max("max_hr"),
-            total_ascent=safe_sum("total_ascent"),
-            max_elevation=safe_max("max_elevation"),
-            avg_cadence=safe_mean("avg_cadence"),
-            max_cadence=safe_max("max_cadence"),
-            total_calories=int(safe_sum("calories") or 0),
-        )
+        # Averages, maxima and sums only take non-null values into account
+        values = {
+            "total_activities": total_activities,
+            "total_duration": float(present("duration").sum(dtype=np.float64)),
+            "total_distance": float(present("distance").sum(dtype=np.float64)),
+        }
+        value_counts = {}
+
+        for field in SUMMARY_AVG_FIELDS:
+            column = present(field)
+            value_counts[field] = len(column)
+            values[field] = float(column.mean(dtype=np.float64)) if len(column) else None
+
+        for field in SUMMARY_MAX_FIELDS:
+            column = present(field)
+            values[field] = float(column.max()) if len(column) else None
+
+        ascents = present("total_ascent")
+        values["total_ascent"] = float(ascents.sum(dtype=np.float64)) if len(ascents) else None
+        values["total_calories"] = int(present("calories").sum(dtype=np.float64))
+
+        summary = ActivitySummary(**values)
+        summary._value_counts = value_counts
+        return summary
+
+    @staticmethod
+    def index_by_type(activities: list[ActivityRow]) -> dict[str, list[int]]:
+        """
+        Index activity positions by activity type.
+
+        Args:
+            activities: List of ActivityRow instances
+
+        Returns:
+            Mapping of activity type to the ascending positions of its activities
+        """
+        by_type: dict[str, list[int]] = defaultdict(list)
+        for i, activity in enumerate(activities):
+            by_type[activity.activity_type].append(i)
+        return dict(by_type)
+
+    @staticmethod
+    def calculate_summaries_by_type(
+        activities: list[ActivityRow],
+        type_index: Optional[dict[str, list[int]]] = None,
+        arrays: Optional[dict[str, np.ndarray]] = None,
+    ) -> dict[str, ActivitySummary]:
+        """
+        Calculate one summary per activity type.
+
+        The partial summaries can be combined with ActivitySummary.merge to get
+        the summary of any type selection without rescanning the activities.
+
+        Args:
+            activities: List of ActivityRow instances
+            type_index: Positions by activity type, as built by index_by_type (optional)
+            arrays: Activity columns, as built by to_columns (optional)
+
+        Returns:
+            Mapping of activity type to its ActivitySummary
+        """
+        if type_index is None:
+            type_index = DataProcessor.index_by_type(activities)
+        if arrays is None:
+            arrays = DataProcessor.to_columns(activities, SUMMARY_SOURCE_FIELDS)
+
+        return {
+            activity_type: DataProcessor.calculate_summary_from_columns(
+                arrays, np.asarray(positions, dtype=np.intp)
+            )
+            for activity_type, positions in type_index.items()
+        }
+
+    @staticmethod
+    def positions_for_types(
+        type_index: dict[str, list[int]], activity_types: Collection[str]
+    ) -> list[int]:
+        """
+        Get the positions of the activities of the given types.
+
+        Args:
+            type_index: Positions by activity type, as built by index_by_type
+            activity_types: Activity types to include
+
+        Returns:
+            Ascending activity positions
+        """
+        selected = [type_index[t] for t in set(activity_types) if t in type_index]
+        return list(heapq.merge(*selected))
 
     @staticmethod
     def filter_activities(
-        activities: list[Activity],
-        activity_types: Optional[list[str]] = None,
+        activities: list[ActivityRow],
+        activity_types: Optional[Collection[str]] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> list[Activity]:
+        type_index: Optional[dict[str, list[int]]] = None,
+    ) -> list[ActivityRow]:
         """
         Filter activities by type and date range.
 
         Args:
             activities: List of activities to filter
-            activity_types: List of activity types to include
+            activity_types: Activity types to include
             start_date: Start date for filtering
             end_date: End date for filtering
+            type_index: Positions by activity type, as built by index_by_type (optional)
 
         Returns:
             Filtered list of activities
         """
+        # Fast path: merge the indexed positions of the selected types, keeping order
+        if type_index is not None and activity_types and not start_date and not end_date:
+            positions = DataProcessor.positions_for_types(type_index, activity_types)
+            return [activities[i] for i in positions]
+
         filtered = activities
 
         # Filter by activity type
@@ -178,61 +353,40 @@ class DataProcessor:
         return filtered
 
     @staticmethod
-    def activities_to_dataframe(activities: list[Activity]) -> pd.DataFrame:
+    def columns_to_dataframe(
+        arrays: dict[str, np.ndarray],
+        positions: Optional[list[int]] = None,
+        columns: Optional[Collection[str]] = None,
+    ) -> pd.DataFrame:
         """
-        Convert activities to pandas DataFrame for export.
+        Convert activity columns to pandas DataFrame for export.
 
         Args:
-            activities: List of activities
+            arrays: Activity columns, as built by to_columns
+            positions: Positions of the activities to include (optional, defaults to all)
+            columns: Activity fields to include (optional, defaults to all)
 
         Returns:
             DataFrame with activity data
         """
-        if not activities:
-            return pd.DataFrame()
-
-        data = [activity.model_dump() for activity in activities]
-        df = pd.DataFrame(data)
+        # Build column-wise from the arrays, taking only the selected activities
+        fields = [f for f in ACTIVITY_FIELDS if f in arrays and (columns is None or f in columns)]
+        df = pd.DataFrame(
+            {
+                field: arrays[field] if positions is None else arrays[field][positions]
+                for field in fields
+            }
+        )
 
         # Format datetime (DD/MM/YYYY HH:MM without seconds)
-        df["start_time"] = pd.to_datetime(df["start_time"]).dt.strftime("%d/%m/%Y %H:%M")
+        if "start_time" in df.columns:
+            df["start_time"] = pd.to_datetime(df["start_time"]).dt.strftime("%d/%m/%Y %H:%M")
 
-        # Convert duration to readable format (HH:MM without seconds)
-        df["duration_formatted"] = df["duration"].apply(
-            lambda x: f"{int(x // 3600):02d}:{int((x % 3600) // 60):02d}"
-        )
+        # Formatted duration, km and km/h columns are precomputed in parse_activity
 
-        # Convert distance to km (rounded to 2 decimals)
-        df["distance_km"] = (df["distance"] / 1000).round(2)
-
-        # Convert speeds to km/h if in m/s (rounded to 1 decimal)
-        if "avg_speed" in df.columns:
-            df["avg_speed_kmh"] = (df["avg_speed"] * 3.6).round(1)
-        if "max_speed" in df.columns:
-            df["max_speed_kmh"] = (df["max_speed"] * 3.6).round(1)
-
-        # Round elevation metrics to nearest meter (no decimals, convert to int)
-        if "total_ascent" in df.columns:
-            df["total_ascent"] = pd.to_numeric(df["total_ascent"], errors='coerce').round(0).astype('Int64')
-        if "max_elevation" in df.columns:
-            df["max_elevation"] = pd.to_numeric(df["max_elevation"], errors='coerce').round(0).astype('Int64')
-
-        # Round heart rate and cadence metrics to integers (no decimals)
-        if "avg_hr" in df.columns:
-            df["avg_hr"] = pd.to_numeric(df["avg_hr"], errors='coerce').round(0).astype('Int64')
-        if "max_hr" in df.columns:
-            df["max_hr"] = pd.to_numeric(df["max_hr"], errors='coerce').round(0).astype('Int64')
-        if "avg_cadence" in df.columns:
-            df["avg_cadence"] = pd.to_numeric(df["avg_cadence"], errors='coerce').round(0).astype('Int64')
-        if "max_cadence" in df.columns:
-            df["max_cadence"] = pd.to_numeric(df["max_cadence"], errors='coerce').round(0).astype('Int64')
-
-        # Round power and calories to integers (no decimals)
-        if "avg_power" in df.columns:
-            df["avg_power"] = pd.to_numeric(df["avg_power"], errors='coerce').round(0).astype('Int64')
-        if "max_power" in df.columns:
-            df["max_power"] = pd.to_numeric(df["max_power"], errors='coerce').round(0).astype('Int64')
-        if "calories" in df.columns:
-            df["calories"] = pd.to_numeric(df["calories"], errors='coerce').round(0).astype('Int64')
+        # Round elevation, heart rate, cadence, power and calories to integers
+        for column in INTEGER_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors="coerce").round(0).astype("Int64")
 
         return df
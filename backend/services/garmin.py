@@ -1,13 +1,21 @@
 """Garmin Connect service."""
 
-from datetime import datetime, timedelta
+import asyncio
+import time
+from datetime import date, datetime, timedelta
 from typing import Optional
 import logging
 from garminconnect import Garmin
 from garth.exc import GarthHTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.services.cache import AsyncTTLCache, cache_key
 
 logger = logging.getLogger(__name__)
 
+# Default date range of the current minute, as (minute bucket, (start_date, end_date))
+_range_cache: Optional[tuple[int, tuple[datetime, datetime]]] = None
+
 
 class GarminService:
     """Service for interacting with Garmin Connect API."""
@@ -21,10 +29,38 @@ class GarminService:
         "cycling": "cycling",
         "road_biking": "cycling",  # Map road_biking to cycling
     }
+    _CYCLING_KEYS = frozenset(CYCLING_TYPES)
+
+    # Date ranges longer than this are fetched as concurrent windows
+    FETCH_WINDOW_THRESHOLD_DAYS = 30
+    FETCH_WINDOW_DAYS = 7
+
+    # Connection pool shared by every Garmin client, so connections to Garmin
+    # are reused across users instead of each login opening its own pool.
+    # Retry policy of garth's default adapter, plus backing off on rate limiting
+    _http_adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3, status_forcelist=(408, 429, 500, 502, 503, 504), backoff_factor=0.5
+        ),
+    )
+
+    # Garmin responses cached across sessions, keyed by user: activity lists
+    # change when new rides are uploaded, details of an activity don't.
+    # Ranges reaching today only briefly, so a new upload shows up on the next fetch
+    _activities_cache = AsyncTTLCache(ttl_seconds=3600)
+    RECENT_ACTIVITIES_TTL_SECONDS = 60
+    _details_cache = AsyncTTLCache(ttl_seconds=86400)
+
+    # Maximum number of concurrent Garmin API calls across all users, to stay
+    # under Garmin's rate limits (the blocking calls themselves run in threads)
+    _gate = asyncio.Semaphore(8)
 
     def __init__(self):
         """Initialize Garmin service."""
         self.client: Optional[Garmin] = None
+        self.email: Optional[str] = None
 
     async def login(self, email: str, password: str) -> bool:
         """
@@ -43,6 +79,8 @@ class GarminService:
         try:
             self.client = Garmin(email, password)
             self.client.login()
+            self.client.garth.sess.mount("https://", self._http_adapter)
+            self.email = email
             logger.info(f"Successfully logged in to Garmin Connect for {email}")
             return True
         except GarthHTTPError as e:
@@ -52,6 +90,46 @@ class GarminService:
             logger.error(f"Unexpected error during Garmin login: {e}")
             raise ValueError(f"Login failed: {e}")
 
+    async def resume(self, tokens: str, email: Optional[str] = None) -> None:
+        """
+        Resume a Garmin Connect login from stored tokens.
+
+        Args:
+            tokens: Tokens as returned by dump_tokens
+            email: Email of the user the tokens belong to (optional, enables response caching)
+
+        Raises:
+            ValueError: If the tokens can't be used
+        """
+        try:
+            self.client = Garmin()
+            await asyncio.to_thread(self.client.login, tokens)
+            # Mounted after the login: loading tokens reconfigures garth, which
+            # mounts a fresh default adapter over any adapter mounted before
+            self.client.garth.sess.mount("https://", self._http_adapter)
+            self.email = email
+            logger.info("Resumed Garmin Connect login from stored tokens")
+        except Exception as e:
+            self.client = None
+            logger.error(f"Could not resume Garmin login: {e}")
+            raise ValueError(f"Could not resume login: {e}")
+
+    def dump_tokens(self) -> str:
+        """
+        Serialize the OAuth tokens of the current login.
+
+        Only the tokens are stored, the client is rebuilt from them by resume.
+
+        Returns:
+            Encoded tokens
+
+        Raises:
+            ValueError: If not logged in
+        """
+        if not self.client:
+            raise ValueError("Not logged in to Garmin Connect")
+        return self.client.garth.dumps()
+
     async def get_user_profile(self) -> dict:
         """
         Get user profile information from Garmin Connect.
@@ -79,6 +157,9 @@ class GarminService:
         """
         Get cycling activities from Garmin Connect.
 
+        Responses are cached per user and date range for an hour, or a minute
+        for ranges ending today or later.
+
         Args:
             start_date: Start date for activity retrieval
             end_date: End date for activity retrieval
@@ -93,28 +174,49 @@ class GarminService:
         if not self.client:
             raise ValueError("Not logged in to Garmin Connect")
 
-        try:
-            # Get activities from Garmin
-            # Format dates as YYYY-MM-DD (required by Garmin API)
-            activities = self.client.get_activities_by_date(
-                start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
-            )
+        # Format dates as YYYY-MM-DD (required by Garmin API)
+        start = start_date.strftime("%Y-%m-%d")
+        end = end_date.strftime("%Y-%m-%d")
 
-            # Filter for cycling activities
-            cycling_activities = []
-            for activity in activities:
-                activity_type = activity.get("activityType", {}).get("typeKey", "").lower()
+        # Only cache for a known user, so cached activities can't leak between accounts
+        key = None
+        if self.email:
+            types = tuple(sorted(activity_types)) if activity_types is not None else None
+            key = cache_key(self.email, start, end, types)
+            cached = await self._activities_cache.get(key)
+            if cached is not None:
+                logger.debug(f"Using cached activities from {start} to {end}")
+                return list(cached)
 
-                # Check if it's a cycling activity
-                if activity_type in self.CYCLING_TYPES:
-                    # If activity_types filter is provided, check if this type is included
-                    if activity_types is None or activity_type in activity_types:
-                        cycling_activities.append(activity)
+        try:
+            # Get activities from Garmin (blocking call, run in a thread)
+            async with self._gate:
+                activities = await asyncio.to_thread(self.client.get_activities_by_date, start, end)
+
+            # Filter for cycling activities, in the activity_types filter when provided.
+            # Garmin type keys are lowercase, only lowercase the ones that don't match
+            cycling_keys = self._CYCLING_KEYS
+            types_filter = set(activity_types) if activity_types is not None else None
+            cycling_activities = [
+                activity
+                for activity in activities
+                if (
+                    (activity_type := activity.get("activityType", {}).get("typeKey", ""))
+                    in cycling_keys
+                    or (activity_type := activity_type.lower()) in cycling_keys
+                )
+                and (types_filter is None or activity_type in types_filter)
+            ]
 
             logger.info(
                 f"Retrieved {len(cycling_activities)} cycling activities from {start_date} to {end_date}"
             )
-            return cycling_activities
+            if key is not None:
+                ttl = None
+                if end_date.date() >= date.today():
+                    ttl = self.RECENT_ACTIVITIES_TTL_SECONDS
+                await self._activities_cache.set(key, cycling_activities, ttl)
+            return list(cycling_activities)
 
         except GarthHTTPError as e:
             logger.error(f"Error retrieving activities: {e}")
@@ -127,6 +229,8 @@ class GarminService:
         """
         Get detailed information for a specific activity.
 
+        Responses are cached per user for a day, activity details don't change.
+
         Args:
             activity_id: Activity ID
 
@@ -139,9 +243,19 @@ class GarminService:
         if not self.client:
             raise ValueError("Not logged in to Garmin Connect")
 
+        key = cache_key(self.email, activity_id) if self.email else None
+        if key is not None:
+            cached = await self._details_cache.get(key)
+            if cached is not None:
+                return cached
+
         try:
-            details = self.client.get_activity(activity_id)
+            # Blocking call, run in a thread so concurrent fetches overlap
+            async with self._gate:
+                details = await asyncio.to_thread(self.client.get_activity, activity_id)
             logger.info(f"Retrieved details for activity {activity_id}")
+            if key is not None:
+                await self._details_cache.set(key, details)
             return details
         except Exception as e:
             logger.error(f"Error retrieving activity details: {e}")
@@ -154,18 +268,61 @@ class GarminService:
                 # garminconnect doesn't have an explicit logout method
                 # Just clear the client reference
                 self.client = None
+                self.email = None
                 logger.info("Logged out from Garmin Connect")
             except Exception as e:
                 logger.error(f"Error during logout: {e}")
 
+    @classmethod
+    def split_date_range(
+        cls, start_date: datetime, end_date: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        Split a long date range into consecutive windows that can be fetched concurrently.
+
+        Garmin pages through a date range 20 activities at a time, so long ranges
+        are split into FETCH_WINDOW_DAYS windows covering each day exactly once.
+        Garmin is queried by calendar day, so timezone info is dropped, keeping the
+        dates as given: a mix of aware and naive dates can then be compared.
+
+        Args:
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            List of naive (start_date, end_date) windows, oldest first
+        """
+        start_date = start_date.replace(tzinfo=None)
+        end_date = end_date.replace(tzinfo=None)
+
+        if (end_date - start_date).days <= cls.FETCH_WINDOW_THRESHOLD_DAYS:
+            return [(start_date, end_date)]
+
+        windows = []
+        window_start = start_date
+        while window_start.date() <= end_date.date():
+            window_end = min(window_start + timedelta(days=cls.FETCH_WINDOW_DAYS - 1), end_date)
+            windows.append((window_start, window_end))
+            window_start += timedelta(days=cls.FETCH_WINDOW_DAYS)
+        return windows
+
     @staticmethod
     def get_default_date_range() -> tuple[datetime, datetime]:
         """
         Get default date range (last 7 days).
 
+        The range is computed once per minute and shared between calls.
+
         Returns:
             Tuple of (start_date, end_date)
         """
+        global _range_cache
+        bucket = int(time.time() // 60)
+        cached = _range_cache
+        if cached is not None and cached[0] == bucket:
+            return cached[1]
+
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
-        return start_date, end_date
+        _range_cache = cached = (bucket, (start_date, end_date))
+        return cached[1]
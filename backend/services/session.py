@@ -2,24 +2,64 @@
 
 import secrets
 import asyncio
-from datetime import datetime, timedelta
+import contextlib
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
 from typing import Optional, Any
-from collections import defaultdict
+from .garmin import GarminService
+from .session_backend import SessionBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _SessionEntry:
+    """Session data with the time.monotonic() of its last access and backend check."""
+
+    data: dict[str, Any]
+    last_active: float
+    checked_at: float = 0.0
 
 
 class SessionManager:
-    """Manages user sessions in memory with automatic timeout."""
+    """
+    Manages user sessions in memory with automatic timeout.
+
+    With a shared backend, the login (email, first name and Garmin tokens) is
+    also stored there so another worker can resume the session without a new
+    Garmin login. Fetched activities stay local to each worker. Every worker
+    re-checks its copy against the backend at most every SHARED_CHECK_SECONDS,
+    which drops sessions logged out on another worker and keeps the stored
+    login from expiring while the session is in use.
+    """
 
-    def __init__(self, timeout_minutes: int = 60):
+    # Minimum time between two last-access updates of a session
+    TOUCH_INTERVAL_SECONDS = 1.0
+
+    # Maximum time a worker serves a session without checking the shared backend
+    SHARED_CHECK_SECONDS = 5.0
+
+    def __init__(self, timeout_minutes: int = 60, backend: Optional[SessionBackend] = None):
         """
         Initialize session manager.
 
         Args:
             timeout_minutes: Session timeout in minutes (default: 60)
+            backend: Shared session backend (optional, sessions stay in memory without it)
         """
         self.timeout_minutes = timeout_minutes
-        self.sessions: dict[str, dict[str, Any]] = {}
-        self.last_activity: dict[str, datetime] = {}
+        self.timeout_seconds = timeout_minutes * 60
+        self.backend = backend
+        self.sessions: dict[str, _SessionEntry] = {}
+        # (expiry, session ID) pairs, lazily corrected: accesses don't push new
+        # entries, an entry found too early is pushed back with its actual expiry
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Guards compound updates of sessions and the expiry heap. Held only
+        # for in-memory updates, never across an await
+        self._lock = threading.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
 
     async def start_cleanup_task(self):
@@ -27,21 +67,65 @@ class SessionManager:
         if self._cleanup_task is None:
             self._cleanup_task = asyncio.create_task(self._cleanup_expired_sessions())
 
+    async def stop_cleanup_task(self):
+        """Stop the background cleanup task."""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._cleanup_task
+            self._cleanup_task = None
+
     async def _cleanup_expired_sessions(self):
         """Background task to remove expired sessions."""
         while True:
             try:
-                await asyncio.sleep(300)  # Check every 5 minutes
-                now = datetime.now()
-                expired_sessions = [
-                    session_id
-                    for session_id, last_active in self.last_activity.items()
-                    if now - last_active > timedelta(minutes=self.timeout_minutes)
-                ]
-                for session_id in expired_sessions:
-                    self.delete_session(session_id)
-            except Exception as e:
-                print(f"Error in cleanup task: {e}")
+                # Sleep until the earliest session could expire
+                now = time.monotonic()
+                if self._expiry_heap:
+                    delay = max(1.0, self._expiry_heap[0][0] - now)
+                else:
+                    delay = max(1.0, self.timeout_seconds)
+                await asyncio.sleep(delay)
+                self._remove_expired_sessions(time.monotonic())
+            except Exception:
+                # CancelledError isn't an Exception, so cancelling still stops the task
+                logger.exception("Error in session cleanup task")
+
+    def _remove_expired_sessions(self, now: float) -> None:
+        """
+        Remove the sessions expired at the given time.
+
+        Only pops the heap entries that are due, instead of scanning every session.
+
+        Args:
+            now: Current time.monotonic()
+        """
+        heap = self._expiry_heap
+        with self._lock:
+            while heap and heap[0][0] <= now:
+                _, session_id = heapq.heappop(heap)
+                entry = self.sessions.get(session_id)
+                if entry is None:
+                    continue  # Already deleted
+                expires_at = entry.last_active + self.timeout_seconds
+                if expires_at <= now:
+                    del self.sessions[session_id]
+                else:
+                    # Accessed since it was pushed, check again at its actual expiry
+                    heapq.heappush(heap, (expires_at, session_id))
+
+    def _add_session(self, session_id: str, data: dict[str, Any]) -> None:
+        """
+        Store a new session and schedule its expiry.
+
+        Args:
+            session_id: Session ID
+            data: Session data
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.sessions[session_id] = _SessionEntry(data, now, checked_at=now)
+            heapq.heappush(self._expiry_heap, (now + self.timeout_seconds, session_id))
 
     def create_session(self) -> str:
         """
@@ -50,9 +134,8 @@ class SessionManager:
         Returns:
             Session ID
         """
-        session_id = secrets.token_urlsafe(32)
-        self.sessions[session_id] = {}
-        self.last_activity[session_id] = datetime.now()
+        session_id = secrets.token_urlsafe(16)
+        self._add_session(session_id, {})
         return session_id
 
     def get_session(self, session_id: str) -> Optional[dict[str, Any]]:
@@ -65,17 +148,138 @@ class SessionManager:
         Returns:
             Session data or None if session doesn't exist or is expired
         """
-        if session_id not in self.sessions:
+        entry = self.sessions.get(session_id)
+        if entry is None:
             return None
 
         # Check if session is expired
-        if self._is_expired(session_id):
+        now = time.monotonic()
+        if now - entry.last_active > self.timeout_seconds:
             self.delete_session(session_id)
             return None
 
-        # Update last activity
-        self.last_activity[session_id] = datetime.now()
-        return self.sessions[session_id]
+        # Update last activity, skipping bursts of requests within TOUCH_INTERVAL_SECONDS
+        if now - entry.last_active > self.TOUCH_INTERVAL_SECONDS:
+            entry.last_active = now
+        return entry.data
+
+    def exists(self, session_id: str) -> bool:
+        """
+        Check if this worker has an unexpired session, without counting it as an access.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            True if the session exists and isn't expired, False otherwise
+        """
+        entry = self.sessions.get(session_id)
+        return entry is not None and time.monotonic() - entry.last_active <= self.timeout_seconds
+
+    async def resolve_session(self, session_id: str) -> Optional[dict[str, Any]]:
+        """
+        Get session data, resuming it from the shared backend if this worker doesn't have it.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Session data or None if session doesn't exist or is expired
+        """
+        session = self.get_session(session_id)
+        if self.backend is None:
+            return session
+
+        if session is not None:
+            entry = self.sessions.get(session_id)
+            now = time.monotonic()
+            if entry is not None and now - entry.checked_at > self.SHARED_CHECK_SECONDS:
+                # Claim the check before awaiting, so concurrent requests don't repeat it
+                entry.checked_at = now
+                if not await self.backend.touch(session_id, self.timeout_seconds):
+                    # Logged out on another worker (or expired there)
+                    self.delete_session(session_id)
+                    return None
+            return session
+
+        shared = await self.backend.get(session_id)
+        if not shared:
+            return None
+
+        garmin_service = GarminService()
+        try:
+            await garmin_service.resume(shared["garmin_tokens"], shared["email"])
+        except ValueError:
+            await self.backend.delete(session_id)
+            return None
+
+        # Another request may have resumed the session meanwhile
+        session = self.get_session(session_id)
+        if session is not None:
+            return session
+
+        start_date, end_date = GarminService.get_default_date_range()
+        session = {
+            "garmin_service": garmin_service,
+            "email": shared["email"],
+            "first_name": shared["first_name"],
+            "start_date": start_date,
+            "end_date": end_date,
+            "activities": [],
+        }
+        self._add_session(session_id, session)
+        return session
+
+    async def resolve_session_and_count(
+        self, session_id: str
+    ) -> tuple[Optional[dict[str, Any]], int]:
+        """
+        Resolve session data together with the number of active sessions.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Tuple of (session data or None, number of active sessions on this worker)
+        """
+        session = await self.resolve_session(session_id)
+        return session, len(self.sessions)
+
+    async def share_session(self, session_id: str) -> None:
+        """
+        Store the login of a session in the shared backend.
+
+        Args:
+            session_id: Session ID
+        """
+        entry = self.sessions.get(session_id)
+        if self.backend is None or entry is None:
+            return
+        session = entry.data
+
+        await self.backend.set(
+            session_id,
+            {
+                "email": session.get("email"),
+                "first_name": session.get("first_name", "User"),
+                "garmin_tokens": session["garmin_service"].dump_tokens(),
+            },
+            ttl_seconds=self.timeout_seconds,
+        )
+
+    async def end_session(self, session_id: str) -> Optional[dict[str, Any]]:
+        """
+        Remove a session from this worker and the shared backend.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Session data or None if this worker doesn't have the session
+        """
+        if self.backend is not None:
+            await self.backend.delete(session_id)
+        return self.pop_session(session_id)
 
     def update_session(self, session_id: str, data: dict[str, Any]) -> bool:
         """
@@ -88,11 +292,13 @@ class SessionManager:
         Returns:
             True if successful, False if session doesn't exist
         """
-        if session_id not in self.sessions:
-            return False
+        with self._lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return False
 
-        self.sessions[session_id].update(data)
-        self.last_activity[session_id] = datetime.now()
+            entry.data.update(data)
+            entry.last_active = time.monotonic()
         return True
 
     def delete_session(self, session_id: str) -> bool:
@@ -105,28 +311,22 @@ class SessionManager:
         Returns:
             True if successful, False if session doesn't exist
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            del self.last_activity[session_id]
-            return True
-        return False
+        with self._lock:
+            return self.sessions.pop(session_id, None) is not None
 
-    def _is_expired(self, session_id: str) -> bool:
+    def pop_session(self, session_id: str) -> Optional[dict[str, Any]]:
         """
-        Check if a session is expired.
+        Remove a session and return its data.
 
         Args:
             session_id: Session ID
 
         Returns:
-            True if expired, False otherwise
+            Session data or None if session doesn't exist
         """
-        if session_id not in self.last_activity:
-            return True
-
-        last_active = self.last_activity[session_id]
-        now = datetime.now()
-        return now - last_active > timedelta(minutes=self.timeout_minutes)
+        with self._lock:
+            entry = self.sessions.pop(session_id, None)
+        return entry.data if entry is not None else None
 
     def get_active_session_count(self) -> int:
         """Get the number of active sessions."""
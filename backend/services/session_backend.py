@@ -0,0 +1,115 @@
+"""Shared session storage backends."""
+
+import logging
+from typing import Any, Optional, Protocol
+import orjson
+
+try:
+    from redis.asyncio import Redis
+    from redis.exceptions import RedisError
+except ImportError:  # redis is an optional dependency
+    Redis = None
+    RedisError = Exception
+
+logger = logging.getLogger(__name__)
+
+
+class SessionBackend(Protocol):
+    """Storage shared between workers for the resumable part of a session."""
+
+    async def get(self, session_id: str) -> Optional[dict[str, Any]]: ...
+
+    async def set(self, session_id: str, data: dict[str, Any], ttl_seconds: int) -> None: ...
+
+    async def touch(self, session_id: str, ttl_seconds: int) -> bool: ...
+
+    async def delete(self, session_id: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisSessionBackend:
+    """
+    Session backend stored in Redis.
+
+    Backend failures are logged and treated as a miss, so a Redis outage only
+    degrades to per-worker sessions instead of failing requests.
+    """
+
+    def __init__(self, redis: "Redis", key_prefix: str = "bikestat:session:"):
+        """
+        Initialize Redis session backend.
+
+        Args:
+            redis: Redis client
+            key_prefix: Prefix for session keys
+        """
+        self.redis = redis
+        self.key_prefix = key_prefix
+
+    async def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        try:
+            value = await self.redis.get(self.key_prefix + session_id)
+        except RedisError as e:
+            logger.warning(f"Could not read session from Redis: {e}")
+            return None
+        if value is None:
+            return None
+
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Ignoring malformed session in Redis: {e}")
+            return None
+
+    async def set(self, session_id: str, data: dict[str, Any], ttl_seconds: int) -> None:
+        try:
+            await self.redis.set(self.key_prefix + session_id, orjson.dumps(data), ex=ttl_seconds)
+        except RedisError as e:
+            logger.warning(f"Could not write session to Redis: {e}")
+
+    async def touch(self, session_id: str, ttl_seconds: int) -> bool:
+        """Refresh the expiry of a session, returning False if it no longer exists."""
+        try:
+            return bool(await self.redis.expire(self.key_prefix + session_id, ttl_seconds))
+        except RedisError as e:
+            logger.warning(f"Could not refresh session in Redis: {e}")
+            return True
+
+    async def delete(self, session_id: str) -> None:
+        try:
+            await self.redis.delete(self.key_prefix + session_id)
+        except RedisError as e:
+            logger.warning(f"Could not delete session from Redis: {e}")
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+async def connect_session_backend(redis_url: Optional[str]) -> Optional[SessionBackend]:
+    """
+    Connect the shared session backend.
+
+    Args:
+        redis_url: Redis URL (optional)
+
+    Returns:
+        Connected backend, or None to keep sessions in memory only
+    """
+    if not redis_url:
+        return None
+
+    if Redis is None:
+        logger.warning("BIKESTAT_REDIS_URL is set but redis isn't installed, using memory sessions")
+        return None
+
+    redis = Redis.from_url(redis_url)
+    try:
+        await redis.ping()
+    except RedisError as e:
+        logger.warning(f"Redis unavailable ({e}), using memory sessions")
+        await redis.aclose()
+        return None
+
+    logger.info("Sessions shared through Redis")
+    return RedisSessionBackend(redis)
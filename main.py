@@ -1,15 +1,22 @@
 """Main FastAPI application for BikeStat."""
 
+import hashlib
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from backend.api import auth_router, activities_router, export_router
-from backend.services import SessionManager
+from backend.api.caching import CACHE_CONTROL, ETagMiddleware, etag_matches
+from backend.api.middleware import AuthRequiredMiddleware
+from backend.services import SessionManager, connect_session_backend
 
 # Configure logging
 logging.basicConfig(
@@ -23,21 +30,44 @@ BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "backend" / "templates"
 STATIC_DIR = BASE_DIR / "backend" / "static"
 
+# PDF rendering processes per uvicorn worker (every worker has its own pool)
+PDF_RENDER_PROCESSES = min(2, os.cpu_count() or 1)
+
+# Health check response, constant while the app is up, so pollers can revalidate it
+HEALTH_PAYLOAD = {"status": "healthy", "service": "BikeStat"}
+HEALTH_ETAG = '"' + hashlib.blake2b(b"BikeStat-healthy", digest_size=16).hexdigest() + '"'
+HEALTH_HEADERS = {"ETag": HEALTH_ETAG, "Cache-Control": "max-age=30"}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     # Startup
     logger.info("Starting BikeStat application...")
-    session_manager = SessionManager(timeout_minutes=60)
+    session_backend = await connect_session_backend(os.environ.get("BIKESTAT_REDIS_URL"))
+    session_manager = SessionManager(timeout_minutes=60, backend=session_backend)
     await session_manager.start_cleanup_task()
     app.state.session_manager = session_manager
     logger.info("Session manager initialized")
+    app.state.parse_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="parse")
+    # Forkserver, not fork: forking the multithreaded server can deadlock the child
+    app.state.cpu_pool = ProcessPoolExecutor(
+        max_workers=PDF_RENDER_PROCESSES, mp_context=multiprocessing.get_context("forkserver")
+    )
+
+    # Compile the page templates now rather than on the first request
+    for template in PAGE_TEMPLATES:
+        templates.get_template(template)
 
     yield
 
     # Shutdown
     logger.info("Shutting down BikeStat application...")
+    await session_manager.stop_cleanup_task()
+    app.state.parse_pool.shutdown(wait=False, cancel_futures=True)
+    app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    if session_backend is not None:
+        await session_backend.close()
 
 
 # Create FastAPI app
@@ -48,12 +78,26 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Mount static files
-STATIC_DIR.mkdir(exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# HTTP caching for activity and export GETs
+app.add_middleware(ETagMiddleware)
 
-# Templates
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Reject unauthenticated API requests before routing (added last, so it runs first)
+app.add_middleware(AuthRequiredMiddleware)
+
+# Mount static files (the directory is created here, so StaticFiles needn't check it)
+STATIC_DIR.mkdir(exist_ok=True)
+app.mount("/static", StaticFiles(directory=str(STATIC_DIR), check_dir=False), name="static")
+
+# Templates, with compiled bytecode cached on disk so new workers skip compiling
+# (auto_reload stays on so template edits show up under reload=True)
+PAGE_TEMPLATES = ("index.html", "dashboard.html")
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        bytecode_cache=FileSystemBytecodeCache(),
+        autoescape=select_autoescape(),
+    )
+)
 
 # Include routers
 app.include_router(auth_router)
@@ -67,9 +111,9 @@ async def index(request: Request):
     # Check if already logged in
     session_id = request.cookies.get("session_id")
     if session_id:
+        # Cheap local check first, only resume from the shared backend when it misses
         session_manager: SessionManager = request.app.state.session_manager
-        session = session_manager.get_session(session_id)
-        if session:
+        if session_manager.exists(session_id) or await session_manager.resolve_session(session_id):
             return RedirectResponse(url="/dashboard", status_code=303)
 
     return templates.TemplateResponse("index.html", {"request": request})
@@ -84,7 +128,7 @@ async def dashboard(request: Request):
         return RedirectResponse(url="/", status_code=303)
 
     session_manager: SessionManager = request.app.state.session_manager
-    session = session_manager.get_session(session_id)
+    session = await session_manager.resolve_session(session_id)
 
     if not session:
         response = RedirectResponse(url="/", status_code=303)
@@ -104,13 +148,16 @@ async def dashboard(request: Request):
             "start_date": start_date,
             "end_date": end_date,
         },
+        headers={"Cache-Control": CACHE_CONTROL},
     )
 
 
 @app.get("/health")
-async def health():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "BikeStat"}
+async def health(request: Request):
+    """Health check endpoint, answering 304 to pollers with a current ETag."""
+    if etag_matches(request, HEALTH_ETAG):
+        return Response(status_code=304, headers=HEALTH_HEADERS)
+    return JSONResponse(HEALTH_PAYLOAD, headers=HEALTH_HEADERS)
 
 
 def main():
@@ -0,0 +1,84 @@
+"""Tests for the activities endpoints."""
+
+from fastapi.testclient import TestClient
+import main
+from backend.api.activities import FILTER_CACHE_SIZE, get_filtered_activities
+from backend.services import GarminService
+from backend.services.cache import LRUCache
+
+
+def test_filter_cache_is_bounded():
+    session = {"activities": [], "activities_version": "v1"}
+
+    for i in range(FILTER_CACHE_SIZE * 20):
+        get_filtered_activities(session, frozenset({f"junk_{i}"}))
+
+    assert len(session["filter_cache"]) == FILTER_CACHE_SIZE
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+class FakeGarminClient:
+    """Garmin client returning activities with a missing and a repeated id."""
+
+    def get_activities_by_date(self, start, end):
+        return [
+            {"activityId": 7, "activityName": "A", "activityType": {"typeKey": "cycling"}},
+            {"activityId": 7, "activityName": "B", "activityType": {"typeKey": "cycling"}},
+            {"activityName": "C", "activityType": {"typeKey": "gravel_cycling"}},
+            {"activityName": "D", "activityType": {"typeKey": "cycling"}},
+        ]
+
+
+def test_activities_without_unique_ids_are_all_listed():
+    with TestClient(main.app) as client:
+        session_manager = main.app.state.session_manager
+        session_id = session_manager.create_session()
+        service = GarminService()
+        service.client = FakeGarminClient()
+        start, end = GarminService.get_default_date_range()
+        session_manager.update_session(
+            session_id, {"garmin_service": service, "start_date": start, "end_date": end}
+        )
+        client.cookies.set("session_id", session_id)
+
+        fetched = client.post("/activities/fetch").json()
+        listed = client.get("/activities/list").json()
+        cycling = client.get("/activities/list?activity_types=cycling").json()
+
+    assert [a["activity_name"] for a in fetched["activities"]] == ["A", "B", "C", "D"]
+    assert [a["activity_name"] for a in listed["activities"]] == ["A", "B", "C", "D"]
+    assert [a["activity_name"] for a in cycling["activities"]] == ["A", "B", "D"]
+
+
+def test_etag_changes_when_another_worker_fetches():
+    with TestClient(main.app) as client:
+        session_manager = main.app.state.session_manager
+        session_id = session_manager.create_session()
+        client.cookies.set("session_id", session_id)
+
+        etags = []
+        for _ in range(2):
+            # Each iteration stands for a worker starting from a freshly resumed session
+            service = GarminService()
+            service.client = FakeGarminClient()
+            start, end = GarminService.get_default_date_range()
+            session_manager.delete_session(session_id)
+            session_manager._add_session(
+                session_id,
+                {"garmin_service": service, "start_date": start, "end_date": end, "activities": []},
+            )
+            client.post("/activities/fetch")
+            etags.append(client.get("/activities/list").headers["etag"])
+
+    assert etags[0] != etags[1]
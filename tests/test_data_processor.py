@@ -0,0 +1,52 @@
+"""Tests for activity data processing."""
+
+from backend.services import DataProcessor
+
+
+def _activities():
+    raw = [
+        {
+            "activityId": 1,
+            "duration": 3723.329698347,
+            "distance": 35123.7,
+            "averageSpeed": 5.123456789012345,
+            "maxSpeed": 19.879677089600392,
+        },
+        {
+            "activityId": 2,
+            "duration": 1801.1,
+            "distance": 12345.6,
+            "averageSpeed": 6.987654321098765,
+            "maxSpeed": 12.345678901234567,
+        },
+    ]
+    return DataProcessor.parse_activities(raw)
+
+
+def test_summary_speeds_keep_full_precision():
+    activities = _activities()
+    arrays = DataProcessor.to_columns(activities)
+
+    summary = DataProcessor.calculate_summary_from_columns(arrays)
+
+    assert summary.max_speed == 19.879677089600392
+    assert summary.avg_speed == (5.123456789012345 + 6.987654321098765) / 2
+
+
+def test_summary_totals_keep_full_precision():
+    arrays = DataProcessor.to_columns(_activities())
+
+    summary = DataProcessor.calculate_summary_from_columns(arrays)
+
+    assert summary.total_duration == 3723.329698347 + 1801.1
+    assert summary.total_distance == 35123.7 + 12345.6
+
+
+def test_summaries_by_type():
+    activities = _activities()
+
+    by_type = DataProcessor.calculate_summaries_by_type(activities)
+
+    assert by_type["unknown"].total_activities == 2
+    assert by_type["unknown"].max_speed == 19.879677089600392
+    assert by_type["unknown"].total_distance == 35123.7 + 12345.6
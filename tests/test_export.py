@@ -0,0 +1,31 @@
+"""Tests for the export endpoints helpers."""
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from backend.api.export import (
+    PDF_BODY_FONT,
+    PDF_BODY_FONT_SIZE,
+    PDF_CELL_PADDING,
+    PDF_COLUMN_WIDTHS,
+    PDF_DATAFRAME_CACHE_SIZE,
+    _fit_pdf_text,
+    get_pdf_dataframe,
+)
+
+
+def test_pdf_dataframe_cache_is_bounded():
+    session = {"activities": [], "activities_version": "v1"}
+
+    for i in range(PDF_DATAFRAME_CACHE_SIZE * 5):
+        get_pdf_dataframe(session, frozenset({f"junk_{i}"}), [])
+
+    assert len(session["dataframe_cache"]) == PDF_DATAFRAME_CACHE_SIZE
+
+
+def test_pdf_names_fit_their_column():
+    width = PDF_COLUMN_WIDTHS["activity_name"]
+
+    fitted = _fit_pdf_text("Tour de Romandie Stage 3", width)
+
+    assert "Tour de Romandie Stage 3".startswith(fitted)
+    assert stringWidth(fitted, PDF_BODY_FONT, PDF_BODY_FONT_SIZE) <= width - 2 * PDF_CELL_PADDING
+    assert _fit_pdf_text("Morning Ride", width) == "Morning Ride"
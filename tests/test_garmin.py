@@ -0,0 +1,105 @@
+"""Tests for the Garmin Connect service."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import garth
+from backend.services import GarminService
+from backend.services import garmin as garmin_module
+from backend.services.cache import AsyncTTLCache
+
+
+class FakeGarmin:
+    """Garmin client whose token login reconfigures garth, like loading real tokens."""
+
+    def __init__(self, *args):
+        self.garth = garth.Client()
+
+    def login(self, tokens=None):
+        self.garth.configure()
+
+
+def test_split_date_range_short_range():
+    start = datetime(2025, 1, 1)
+    end = datetime(2025, 1, 10)
+
+    assert GarminService.split_date_range(start, end) == [(start, end)]
+
+
+def test_split_date_range_covers_each_day_once():
+    start = datetime(2025, 1, 1)
+    end = datetime(2025, 3, 1)
+
+    windows = GarminService.split_date_range(start, end)
+
+    assert windows[0][0] == start
+    assert windows[-1][1] == end
+    for (_, previous_end), (next_start, _) in zip(windows, windows[1:]):
+        assert next_start.date() == previous_end.date() + timedelta(days=1)
+
+
+def test_split_date_range_mixed_aware_and_naive_dates():
+    # FetchQuery accepts "...Z" or "+02:00" dates next to naive session dates
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 3, 1)
+
+    windows = GarminService.split_date_range(start, end)
+
+    assert windows[0][0] == datetime(2025, 1, 1)
+    assert windows[-1][1] == end
+
+    short = GarminService.split_date_range(
+        datetime(2025, 1, 1), datetime(2025, 1, 5, tzinfo=timezone(timedelta(hours=2)))
+    )
+    assert short == [(datetime(2025, 1, 1), datetime(2025, 1, 5))]
+
+
+def test_resume_keeps_shared_adapter(monkeypatch):
+    monkeypatch.setattr(garmin_module, "Garmin", FakeGarmin)
+    service = GarminService()
+
+    asyncio.run(service.resume("tokens", "user@example.com"))
+
+    adapter = service.client.garth.sess.get_adapter("https://connect.garmin.com")
+    assert adapter is GarminService._http_adapter
+    assert service.email == "user@example.com"
+
+
+def test_login_keeps_shared_adapter(monkeypatch):
+    monkeypatch.setattr(garmin_module, "Garmin", FakeGarmin)
+    service = GarminService()
+
+    asyncio.run(service.login("user@example.com", "password"))
+
+    adapter = service.client.garth.sess.get_adapter("https://connect.garmin.com")
+    assert adapter is GarminService._http_adapter
+
+
+class CountingClient:
+    """Garmin client counting activity list requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_activities_by_date(self, start, end):
+        self.calls += 1
+        return [{"activityId": self.calls, "activityType": {"typeKey": "cycling"}}]
+
+
+def test_activities_cached_briefly_when_range_reaches_today(monkeypatch):
+    monkeypatch.setattr(GarminService, "_activities_cache", AsyncTTLCache(ttl_seconds=3600))
+    service = GarminService()
+    service.client = CountingClient()
+    service.email = "user@example.com"
+
+    async def fetch_twice(start, end):
+        await service.get_activities(start, end)
+        await service.get_activities(start, end)
+
+    old_start, old_end = datetime(2025, 1, 1), datetime(2025, 1, 7)
+    asyncio.run(fetch_twice(old_start, old_end))
+    assert service.client.calls == 1
+
+    monkeypatch.setattr(GarminService, "RECENT_ACTIVITIES_TTL_SECONDS", 0)
+    today = datetime.now()
+    asyncio.run(fetch_twice(today - timedelta(days=7), today))
+    assert service.client.calls == 3
@@ -0,0 +1,104 @@
+"""Tests for session management shared between workers."""
+
+import asyncio
+from backend.services import GarminService, SessionManager
+from backend.services.session_backend import RedisSessionBackend
+
+
+class MemoryBackend:
+    """Session backend kept in a dict, recording TTL refreshes."""
+
+    def __init__(self):
+        self.data = {}
+        self.touched = []
+
+    async def get(self, session_id):
+        return self.data.get(session_id)
+
+    async def set(self, session_id, data, ttl_seconds):
+        self.data[session_id] = data
+
+    async def touch(self, session_id, ttl_seconds):
+        self.touched.append((session_id, ttl_seconds))
+        return session_id in self.data
+
+    async def delete(self, session_id):
+        self.data.pop(session_id, None)
+
+    async def close(self):
+        pass
+
+
+class FakeGarminService:
+    def dump_tokens(self):
+        return "tokens"
+
+
+async def _resume(self, tokens, email=None):
+    self.email = email
+
+
+def _logged_in_workers(monkeypatch):
+    monkeypatch.setattr(GarminService, "resume", _resume)
+    backend = MemoryBackend()
+    worker_a = SessionManager(backend=backend)
+    worker_b = SessionManager(backend=backend)
+    worker_a.SHARED_CHECK_SECONDS = worker_b.SHARED_CHECK_SECONDS = 0.0
+
+    session_id = worker_a.create_session()
+    worker_a.update_session(
+        session_id,
+        {"garmin_service": FakeGarminService(), "email": "user@example.com", "first_name": "U"},
+    )
+    asyncio.run(worker_a.share_session(session_id))
+    return backend, worker_a, worker_b, session_id
+
+
+def test_session_resumed_on_other_worker(monkeypatch):
+    _, _, worker_b, session_id = _logged_in_workers(monkeypatch)
+
+    session = asyncio.run(worker_b.resolve_session(session_id))
+
+    assert session["email"] == "user@example.com"
+    assert session["garmin_service"].email == "user@example.com"
+
+
+def test_logout_ends_resumed_copies(monkeypatch):
+    _, worker_a, worker_b, session_id = _logged_in_workers(monkeypatch)
+    assert asyncio.run(worker_b.resolve_session(session_id)) is not None
+
+    asyncio.run(worker_a.end_session(session_id))
+
+    assert asyncio.run(worker_b.resolve_session(session_id)) is None
+    assert not worker_b.exists(session_id)
+
+
+def test_access_refreshes_shared_expiry(monkeypatch):
+    backend, worker_a, _, session_id = _logged_in_workers(monkeypatch)
+
+    assert asyncio.run(worker_a.resolve_session(session_id)) is not None
+
+    assert backend.touched == [(session_id, worker_a.timeout_seconds)]
+
+
+def test_resolve_session_and_count_resumes_on_other_worker(monkeypatch):
+    _, _, worker_b, session_id = _logged_in_workers(monkeypatch)
+
+    session, active_sessions = asyncio.run(worker_b.resolve_session_and_count(session_id))
+
+    assert session["email"] == "user@example.com"
+    assert active_sessions == 1
+
+
+class FakeRedis:
+    def __init__(self, value):
+        self.value = value
+
+    async def get(self, key):
+        return self.value
+
+
+def test_malformed_shared_session_is_a_miss():
+    backend = RedisSessionBackend(FakeRedis(b"{not json"))
+
+    assert asyncio.run(backend.get("abc")) is None